@@ -75,21 +75,57 @@ In the end, your class could look like this:
     __DESCRIPTION__ = "A sample of class with typed attributes"
 """
 
-def load_version():
+import sys
+
+def _load_version():
 	import os
 	CONTAINING_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 	return open(os.path.join(CONTAINING_DIRECTORY,"VERSION")).read().split()[0]
 
-__VERSION__ = load_version()
-
 from . import typed_parameters
 from . import typed_containers
 
 from ._struct import *
+from ._textualize import (TextualizeLimits,
+                          getTextualizeLimits,
+                          setTextualizeLimits,
+                          textualizeLimits)
+from ._binary import *
+from ._json import *
+from ._record_file import *
+from ._migrations import *
+from ._validation import *
 from ._versioned_struct import *
-from ._display_widget import *
+
+# Attributes only loaded on first access, as they are costly to get (reading
+# the VERSION file, importing a Qt binding) and rarely used
+_LAZY_ATTRIBUTES = ["__VERSION__", "ObjectDisplayWidget"]
+
+if sys.version_info >= (3,7):
+	def __getattr__(name):
+		if name == "__VERSION__":
+			value = _load_version()
+		elif name == "ObjectDisplayWidget":
+			from . import _display_widget
+			if not hasattr(_display_widget, name):
+				raise AttributeError("ObjectDisplayWidget requires Qt.py and a Qt binding")
+			value = _display_widget.ObjectDisplayWidget
+		else:
+			raise AttributeError("module %r has no attribute %r"%(__name__, name))
+
+		# Next accesses will not go through __getattr__ anymore
+		globals()[name] = value
+		return value
+
+	def __dir__():
+		return sorted(set(globals()).union(_LAZY_ATTRIBUTES))
+
+else:
+	# Module-level __getattr__ is not supported (PEP 562)
+	__VERSION__ = _load_version()
+	from ._display_widget import *
 
 # Remove symbols that must not be exported
-del load_version
+del sys
 
 #––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––#
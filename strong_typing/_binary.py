@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Fixed-layout binary packing of Structs
+
+Structs whose parameters are all integers, floats, booleans or enums can be
+packed in records of a fixed size with a :class:`BinaryCodec`.
+"""
+
+# Standard libraries
+import keyword
+import struct
+import sys
+
+# Local modules
+from ._struct import _IDENTIFIER
+from .typed_parameters import (IntegerParameter,
+                               FloatParameter,
+                               BoolParameter,
+                               EnumParameter)
+
+_PACK_TEMPLATE = """
+def pack(_s):
+	return _pack(%(values)s)
+"""
+
+_BUILD_TEMPLATE = """
+def build(_v):
+	_i = _new(_cls)%(body)s
+	return _i
+"""
+
+def _defaultFormat(parameter):
+	if isinstance(parameter, BoolParameter):
+		return "?"
+	elif isinstance(parameter, IntegerParameter):
+		return "q"
+	elif isinstance(parameter, FloatParameter):
+		return "d"
+	elif isinstance(parameter, EnumParameter):
+		# Members are stored by ordinal
+		return "B" if len(parameter.choices) <= 0x100 else "H"
+	raise TypeError("BinaryCodec: %s parameters cannot be packed"%type(parameter).__name__)
+
+class BinaryCodec(object):
+	"""
+	Packs instances of a Struct class in fixed-size binary records
+
+	:param cls: Struct class to pack. Its parameters must all be integers,
+	            floats, booleans or enums
+	:param formats: Format character (see the ``struct`` module) of some
+	                parameters, by id. Integers use ``q``, floats ``d``,
+	                booleans ``?`` and enums the ordinal of the member as
+	                ``B`` (``H`` beyond 256 choices) by default
+	:param byteorder: Byte order prefix of the records' format
+	:raises: TypeError if a parameter cannot be packed
+
+	Records are unpacked without normalizing the values again, and must have
+	been packed with the same format.
+
+	::
+
+	  codec = BinaryCodec(Sample, formats=dict(counter="I", value="f"))
+	  data = codec.packMany(samples)
+	  samples = codec.unpackMany(data)
+	"""
+	def __init__(self, cls, formats=None, byteorder="<"):
+		formats = dict(formats or dict())
+		unknown = set(formats).difference(parameter.id for parameter in cls.__ATTRIBUTES__)
+		if unknown:
+			raise TypeError("BinaryCodec: %s has no parameter %s"%(cls.__name__, ", ".join(sorted(unknown))))
+
+		self._cls = cls
+		self._byteorder = byteorder
+		self._formats = [formats.get(parameter.id) or _defaultFormat(parameter) for parameter in cls.__ATTRIBUTES__]
+		self._struct = struct.Struct(byteorder + "".join(self._formats))
+		self._pack = self._compilePack()
+		self._build = self._compileBuild()
+
+	def _compilePack(self):
+		namespace = dict(_pack=self._struct.pack)
+		values = []
+		for index, parameter in enumerate(self._cls.__ATTRIBUTES__):
+			if _IDENTIFIER.match(parameter.id) and not keyword.iskeyword(parameter.id):
+				value = "_s.%s"%parameter.id
+			else:
+				namespace["_get_%d"%index] = lambda instance, id=parameter.id: getattr(instance, id)
+				value = "_get_%d(_s)"%index
+			if isinstance(parameter, EnumParameter):
+				namespace["_ordinals_%d"%index] = dict((member, ordinal) for ordinal, member in enumerate(parameter.choices))
+				value = "_ordinals_%d[%s]"%(index, value)
+			values.append(value)
+
+		source = _PACK_TEMPLATE%dict(values=", ".join(values))
+		exec(compile(source, "<%s.pack>"%self._cls.__name__, "exec"), namespace)
+		return namespace["pack"]
+
+	def _compileBuild(self):
+		cls = self._cls
+		namespace = dict(_new=cls.__new__, _cls=cls)
+		body = ""
+		for index, (parameter, slot) in enumerate(zip(cls.__ATTRIBUTES__, cls.__PARAMETER_SLOTS__)):
+			namespace["_set_%d"%index] = slot.__set__
+			if isinstance(parameter, EnumParameter):
+				namespace["_members_%d"%index] = tuple(parameter.choices)
+				value = "_members_%d[_v[%d]]"%(index, index)
+			else:
+				value = "_v[%d]"%index
+			body += "\n\t_set_%d(_i, %s)"%(index, value)
+
+		source = _BUILD_TEMPLATE%dict(body=body)
+		exec(compile(source, "<%s.unpack>"%cls.__name__, "exec"), namespace)
+		return namespace["build"]
+
+	def _fields(self):
+		# Yields each parameter with the format and offset of its value in
+		# records
+		for index, parameter in enumerate(self._cls.__ATTRIBUTES__):
+			field_format = self._byteorder + self._formats[index]
+			# Computed with the next field's alignment (for native byte order)
+			offset = struct.calcsize(self._byteorder + "".join(self._formats[:index+1])) - struct.calcsize(field_format)
+			yield parameter, field_format, offset
+
+	# ───────
+	# Methods
+
+	def pack(self, instance):
+		"""
+		Returns the record of ``instance``
+
+		:raises: struct.error if a value does not fit in its format
+		"""
+		return self._pack(instance)
+
+	def unpack(self, data):
+		"""
+		Creates an instance from a record
+
+		:param data: bytes-like object of exactly :attr:`size` bytes
+		"""
+		return self._build(self._struct.unpack(data))
+
+	def packMany(self, instances):
+		"""
+		Returns the concatenated records of ``instances``
+
+		:raises: struct.error if a value does not fit in its format
+		"""
+		return b"".join(map(self._pack, instances))
+
+	def unpackMany(self, data):
+		"""
+		Creates the instances of concatenated records
+
+		:param data: bytes-like object whose size is a multiple of :attr:`size`
+		:returns: list of instances
+		"""
+		build = self._build
+		if sys.version_info >= (3,4):
+			return [build(values) for values in self._struct.iter_unpack(data)]
+
+		size = self._struct.size
+		if len(data) % size:
+			raise struct.error("unpackMany requires a buffer whose size is a multiple of %d"%size)
+		unpack_from = self._struct.unpack_from
+		return [build(unpack_from(data, offset)) for offset in range(0, len(data), size)]
+
+	# ──────────
+	# Properties
+
+	@property
+	def type(self):
+		"""
+		Struct class packed by the codec
+		"""
+		return self._cls
+
+	@property
+	def format(self):
+		"""
+		Format of the records (see the ``struct`` module)
+		"""
+		return self._struct.format
+
+	@property
+	def size(self):
+		"""
+		Size of a record in bytes
+		"""
+		return self._struct.size
+
+__all__ = ["BinaryCodec"]
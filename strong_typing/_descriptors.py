@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Local modules
+from ._validation import state as _validation, ValidationLevel
+
+_FULL = ValidationLevel.FULL
+_OFF = ValidationLevel.OFF
+
+# Marks a default value that was not normalized yet
+_UNSET = object()
+
+def _noNormalizer(value):
+	raise NotImplementedError
+
+class ParameterDescriptor(object):
+	# Gives access to a Struct's parameter, whose value is stored in the slot
+	# named after the parameter's id. The slot is bound once the owning class
+	# is created (see StructMeta).
+	#
+	# Each call to the default value creates a new one, so that mutable values
+	# (like lists or Structs) are never shared between instances.
+	#
+	# Assigned values are checked according to the current ValidationLevel.
+
+	__slots__ = ["_parameter", "_slot", "_normalizer"]
+
+	def __init__(self, parameter):
+		self._parameter = parameter
+		self._slot = None
+		try:
+			self._normalizer = parameter.valueNormalizer
+		except NotImplementedError:
+			self._normalizer = _noNormalizer
+
+	def bind(self, slot):
+		"""
+		Sets the slot in which the parameter's value is stored
+
+		:param slot: Member descriptor created by ``__slots__``
+		"""
+		self._slot = slot
+
+	@property
+	def __doc__(self):
+		# Built on request, as it requires to textualize the default value
+		default = self._parameter.default
+		return "%s\n\nDefault: %s\n\n"%(self._parameter.description,
+		                                str(default) if default != "" else "\"\"")
+
+	@property
+	def slot(self):
+		return self._slot
+
+	def default(self):
+		# The copy is never the parameter's default itself, whatever the
+		# parameter's normalizer keeps
+		return self._parameter.copyValue(self._parameter.default)
+
+	# ──────────────────
+	# Descriptor methods
+
+	def __get__(self, instance, owner):
+		if instance is None:
+			return self._parameter
+		try:
+			return self._slot.__get__(instance, owner)
+		except AttributeError:
+			value = self.default()
+			self._slot.__set__(instance, value)
+			return value
+
+	def __set__(self, instance, value):
+		if value is None or value == "":
+			if _validation.level is not _OFF:
+				value = self.default()
+		elif _validation.level is _FULL:
+			value = self._normalizer(value)
+		self._slot.__set__(instance, value)
+
+	def __delete__(self, instance):
+		self._slot.__set__(instance, self.default())
+
+class ImmutableParameterDescriptor(ParameterDescriptor):
+	# Descriptor for parameters whose values cannot be modified in place
+	# (numbers, strings, enums, ...). Their default value can then be
+	# normalized once and shared by all instances.
+
+	__slots__ = ["_default"]
+
+	# Every class body defines __doc__, so the lazy one must be inherited explicitly
+	__doc__ = ParameterDescriptor.__dict__["__doc__"]
+
+	def __init__(self, parameter):
+		ParameterDescriptor.__init__(self, parameter)
+		self._default = _UNSET
+
+	def default(self):
+		if self._default is _UNSET:
+			self._default = self._parameter.normalizer(self._parameter.default)
+		return self._default
+
+__all__=["ParameterDescriptor", "ImmutableParameterDescriptor"]
@@ -43,7 +43,7 @@ except ImportError:
 
 # Local modules
 from ._struct import Struct
-from .typed_containers import TypedList
+from .typed_containers import TypedArray, TypedList
 
 # Check for Python version
 
@@ -185,7 +185,7 @@ if _qt_available:
 					parent_item.addChild(item)
 
 				# First column
-				if isinstance(parent_obj, TypedList):
+				if isinstance(parent_obj, (TypedList, TypedArray)):
 					item.setText(0, '['+str(key)+']') # Set name in first column
 				else:
 					item.setText(0, str(key)) # Set name in first column
@@ -213,7 +213,7 @@ if _qt_available:
 						inputWidget.editingFinished.connect(lambda: self._refreshTextItem(parent_obj, item, key))
 						## TODO ?? Use a QValidator to prevent Exceptions ?
 
-				elif isinstance(obj, TypedList):
+				elif isinstance(obj, (TypedList, TypedArray)):
 					# obj is a list, add a button to add elements
 					inputWidget = QtWidgets.QPushButton(self)
 					inputWidget.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
@@ -233,7 +233,7 @@ if _qt_available:
 					inputWidget.setEnabled(not self._read_only)
 
 				# Third column
-				if isinstance(parent_obj, TypedList):
+				if isinstance(parent_obj, (TypedList, TypedArray)):
 					# obj is an element of a container that supports removal
 					inputWidget = QtWidgets.QPushButton(self)
 					inputWidget.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
@@ -260,7 +260,7 @@ if _qt_available:
 				return
 			pal = line_edit.palette()
 			try:
-				if isinstance(parent_obj, (dict, list, set, tuple)):
+				if isinstance(parent_obj, (dict, list, set, tuple, TypedArray)):
 					# Save the new value in object if possible
 					parent_obj[key] = line_edit.text()
 					# Retrieve the newly stored value
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+JSON serialization of Structs
+
+Each Struct class gets an encoder and a decoder generated from its
+``__ATTRIBUTES__`` the first time it is serialized. Enums are written with
+their name, typed containers as lists and nested Structs as objects.
+
+Decoding assumes the data was produced by :func:`dumps` (or follows the same
+schema): values are converted to the parameters' types (enums, nested
+Structs, lists), but not normalized again. Data from an untrusted source must
+be given to the Struct's constructor instead: ``MyStruct(**json.loads(text))``.
+"""
+
+# Standard libraries
+import enum
+import json
+import keyword
+import sys
+
+# Local modules
+from ._struct import Struct, _IDENTIFIER, _unexpectedKeyword
+from ._versioned_struct import VersionedStruct
+from .typed_containers import TypedArray, TypedList
+from .typed_parameters import (IntegerParameter,
+                               FloatParameter,
+                               BoolParameter,
+                               StringParameter,
+                               EnumParameter,
+                               VectorParameter,
+                               StructParameter)
+
+_ENCODER_TEMPLATE = """
+def encode(_s):
+	return {%(items)s}
+"""
+
+_DECODER_TEMPLATE = """
+def decode(_d):
+	if not _ids.issuperset(_d):
+		_unknownKey(_ids, _d)
+	_i = _new(_cls)%(body)s
+	return _i
+"""
+
+_DECODE_PARAMETER_TEMPLATE = """
+	_v = _d.get(%(key)r)
+	if _v is not None:
+		_set_%(index)d(_i, %(value)s)"""
+
+def _unknownKey(ids, data):
+	for key in data:
+		if not key in ids:
+			raise TypeError(_unexpectedKeyword(key))
+
+def _enumName(member):
+	return member._name_
+
+# ─────────────────────────────── Value codecs ─────────────────────────────── #
+
+def _valueEncoder(parameter):
+	# Returns the function converting values of parameter to JSON, or None if
+	# they can be written as they are
+	if isinstance(parameter, EnumParameter):
+		return _enumName
+	elif isinstance(parameter, StructParameter):
+		return _codec(parameter.type)[0]
+	elif isinstance(parameter, VectorParameter):
+		return _listEncoder(parameter.type)
+	return None
+
+def _listEncoder(element_type):
+	if isinstance(element_type, type) and issubclass(element_type, Struct):
+		encode = _codec(element_type)[0]
+		return lambda values: [encode(value) for value in values]
+	elif isinstance(element_type, type) and issubclass(element_type, enum.Enum):
+		return lambda values: [value._name_ for value in values]
+	return list
+
+def _valueDecoder(parameter):
+	# Returns the function converting JSON values of parameter, or None if
+	# they can be stored as they are
+	if isinstance(parameter, (IntegerParameter, BoolParameter)):
+		return None
+	elif isinstance(parameter, StringParameter):
+		# Python 2's json returns unicode strings
+		return str if sys.version_info < (3,0) else None
+	elif isinstance(parameter, FloatParameter):
+		return float
+	elif isinstance(parameter, EnumParameter):
+		return parameter.valueNormalizer
+	elif isinstance(parameter, StructParameter):
+		return _codec(parameter.type)[1]
+	elif isinstance(parameter, VectorParameter):
+		return _listDecoder(parameter)
+	return parameter.valueNormalizer
+
+def _listDecoder(parameter):
+	element_type = parameter.type
+	if parameter.packed:
+		return lambda values: TypedArray(element_type, values)
+	elif parameter.lazy:
+		# Elements are converted (and checked) when accessed
+		return lambda values: TypedList(element_type, values, lazy=True)
+	elif isinstance(element_type, type) and issubclass(element_type, Struct):
+		decode = _codec(element_type)[1]
+		return lambda values: TypedList._fromTrusted(element_type, [decode(value) for value in values])
+	elif isinstance(element_type, type) and issubclass(element_type, enum.Enum):
+		return lambda values: TypedList._fromTrusted(element_type, [element_type[name] for name in values])
+	return lambda values: TypedList(element_type, values)
+
+# ──────────────────────────────── Struct codecs ───────────────────────────── #
+
+def _compileEncoder(cls):
+	namespace = dict()
+	items = []
+	for index, parameter in enumerate(cls.__ATTRIBUTES__):
+		if _IDENTIFIER.match(parameter.id) and not keyword.iskeyword(parameter.id):
+			value = "_s.%s"%parameter.id
+		else:
+			namespace["_get_%d"%index] = lambda instance, id=parameter.id: getattr(instance, id)
+			value = "_get_%d(_s)"%index
+		encoder = _valueEncoder(parameter)
+		if encoder is _enumName:
+			value = "%s._name_"%value
+		elif encoder is not None:
+			namespace["_encode_%d"%index] = encoder
+			value = "_encode_%d(%s)"%(index, value)
+		items.append("%r: %s"%(parameter.id, value))
+	if issubclass(cls, VersionedStruct):
+		items.append("'version': %r"%cls.__VERSION__)
+
+	source = _ENCODER_TEMPLATE%dict(items=", ".join(items))
+	exec(compile(source, "<%s.toJson>"%cls.__name__, "exec"), namespace)
+	return namespace["encode"]
+
+def _compileDecoder(cls):
+	ids = frozenset(parameter.id for parameter in cls.__ATTRIBUTES__)
+	namespace = dict(_ids=ids,
+	                 _unknownKey=_unknownKey,
+	                 _new=cls.__new__,
+	                 _cls=cls)
+	body = ""
+	for index, (parameter, slot) in enumerate(zip(cls.__ATTRIBUTES__, cls.__PARAMETER_SLOTS__)):
+		namespace["_set_%d"%index] = slot.__set__
+		decoder = _valueDecoder(parameter)
+		if decoder is None:
+			value = "_v"
+		else:
+			namespace["_decode_%d"%index] = decoder
+			value = "_decode_%d(_v)"%index
+		body += _DECODE_PARAMETER_TEMPLATE%dict(key=parameter.id, index=index, value=value)
+	source = _DECODER_TEMPLATE%dict(body=body)
+	exec(compile(source, "<%s.fromJson>"%cls.__name__, "exec"), namespace)
+	decode = namespace["decode"]
+
+	if issubclass(cls, VersionedStruct):
+		# Data written by another version is migrated and checked by fromDict
+		def decodeVersioned(data):
+			version = data.pop("version", cls.__VERSION__)
+			if version != cls.__VERSION__:
+				data["version"] = version
+				return cls.fromDict(data)
+			return decode(data)
+		return decodeVersioned
+	return decode
+
+def _codec(cls):
+	# Encoder and decoder of cls, compiled on first use
+	if not "__JSON_CODEC__" in cls.__dict__:
+		cls.__JSON_CODEC__ = (_compileEncoder(cls), _compileDecoder(cls))
+	return cls.__JSON_CODEC__
+
+# ─────────────────────────────────── API ──────────────────────────────────── #
+
+def toJsonObject(struct):
+	"""
+	Converts a Struct to dicts, lists and values that can be written in JSON
+
+	:param struct: Struct to convert
+	"""
+	return _codec(type(struct))[0](struct)
+
+def fromJsonObject(cls, data):
+	"""
+	Creates a Struct from the result of :func:`toJsonObject`
+
+	:param cls: Struct class to create
+	:param data: dict of the Struct's values
+	:raises: TypeError if a key does not match any parameter
+	"""
+	return _codec(cls)[1](data)
+
+def dumps(struct, **kwargs):
+	"""
+	Serializes a Struct to a JSON string
+
+	:param struct: Struct to serialize
+	:param kwargs: Extra arguments of ``json.dumps``
+	"""
+	return json.dumps(_codec(type(struct))[0](struct), **kwargs)
+
+def loads(cls, text):
+	"""
+	Creates a Struct from a JSON string produced by :func:`dumps`
+
+	:param cls: Struct class to create
+	:param text: JSON string
+	:raises: TypeError if a key does not match any parameter
+	"""
+	return _codec(cls)[1](json.loads(text))
+
+__all__ = ["dumps", "loads", "toJsonObject", "fromJsonObject"]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Declarative migrations of VersionedStruct data
+
+A :class:`VersionedStruct` lists in ``__MIGRATIONS__`` the steps turning the
+data of its previous version into the data of each of its versions. All the
+steps needed to bring data of a given version up to date are compiled in a
+single function.
+"""
+
+_MIGRATION_TEMPLATE = """
+def migrate(_d):
+	_d = dict(_d)%(body)s
+	return %(result)s
+"""
+
+def _compileMigration(steps, cls=None, name="migration"):
+	"""
+	Returns a function applying the given steps, in order, to a copy of a dict
+
+	The function returns the migrated dict, or the instance of ``cls`` created
+	from it if a class is given.
+	"""
+	namespace = dict(_cls=cls)
+	body = ""
+	for index, step in enumerate(steps):
+		for line in step._source("_step_%d"%index, namespace):
+			body += "\n\t" + line
+	source = _MIGRATION_TEMPLATE%dict(body=body,
+	                                  result="_d" if cls is None else "_cls(**_d)")
+	exec(compile(source, "<%s>"%name, "exec"), namespace)
+	return namespace["migrate"]
+
+class MigrationStep(object):
+	"""
+	Change made to the data of a :class:`VersionedStruct` between two versions
+
+	A step can be applied alone to a dict: it returns a migrated copy of it.
+	"""
+	# Function applying the step alone, compiled on first use
+	_function = None
+
+	def __call__(self, data):
+		if self._function is None:
+			self._function = _compileMigration([self], name=repr(self))
+		return self._function(data)
+
+	def _source(self, name, namespace):
+		# Returns the lines of code applying the step to the dict ``_d``. The
+		# objects they use are stored in ``namespace``, under ``name``.
+		raise NotImplementedError
+
+class Rename(MigrationStep):
+	"""
+	Renames a key of the data
+
+	:param old: Key in the data of the previous version
+	:param new: Key in the data of the new version
+	"""
+	def __init__(self, old, new):
+		self.old = old
+		self.new = new
+
+	def _source(self, name, namespace):
+		return ["if %r in _d:"%self.old,
+		        "\t_d[%r] = _d.pop(%r)"%(self.new, self.old)]
+
+	def __repr__(self):
+		return "Rename(%r, %r)"%(self.old, self.new)
+
+class Drop(MigrationStep):
+	"""
+	Removes a key from the data, if it is there
+
+	:param id: Key of a parameter removed in the new version
+	"""
+	def __init__(self, id):
+		self.id = id
+
+	def _source(self, name, namespace):
+		return ["_d.pop(%r, None)"%self.id]
+
+	def __repr__(self):
+		return "Drop(%r)"%self.id
+
+class Fill(MigrationStep):
+	"""
+	Sets a key missing from the data
+
+	:param id: Key of a parameter added in the new version
+	:param value: Value given to the parameter. It is not copied: values that
+	              must not be shared by all the migrated instances should be
+	              computed by ``function``
+	:param function: Computes the value from the data (as migrated by the
+	                 previous steps) instead
+	"""
+	def __init__(self, id, value=None, function=None):
+		self.id = id
+		self.value = value
+		self.function = function
+
+	def _source(self, name, namespace):
+		if self.function is None:
+			namespace[name] = self.value
+			value = name
+		else:
+			namespace[name] = self.function
+			value = "%s(_d)"%name
+		return ["if not %r in _d:"%self.id,
+		        "\t_d[%r] = %s"%(self.id, value)]
+
+	def __repr__(self):
+		if self.function is None:
+			return "Fill(%r, %r)"%(self.id, self.value)
+		return "Fill(%r, function=%r)"%(self.id, self.function)
+
+class Transform(MigrationStep):
+	"""
+	Converts a value of the data
+
+	:param id: Key of the value to convert, if it is there. If None, the whole
+	           data is given to ``function``, which returns the new data
+	:param function: Returns the value of the new version
+	"""
+	def __init__(self, id, function):
+		self.id = id
+		self.function = function
+
+	def _source(self, name, namespace):
+		namespace[name] = self.function
+		if self.id is None:
+			return ["_d = %s(_d)"%name]
+		return ["if %r in _d:"%self.id,
+		        "\t_d[%r] = %s(_d[%r])"%(self.id, name, self.id)]
+
+	def __repr__(self):
+		return "Transform(%r, %r)"%(self.id, self.function)
+
+__all__ = ["MigrationStep", "Rename", "Drop", "Fill", "Transform"]
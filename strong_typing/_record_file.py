@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Random access to records of fixed-layout Structs stored in a buffer or a file
+
+Records are read and written in place through views: only the accessed values
+are converted, whatever the number of records.
+"""
+
+# Standard libraries
+import mmap
+import os
+import struct
+
+# Local modules
+from ._binary import BinaryCodec
+from .typed_parameters import EnumParameter
+
+# Number of records packed at once by StructFile.write
+_WRITE_BATCH = 4096
+
+class _RecordField(object):
+	"""
+	Descriptor reading and writing a value in the record of a view
+	"""
+	__slots__ = ["_unpack_from", "_pack_into", "_offset", "_normalizer", "_default", "_members", "_ordinals"]
+
+	def __init__(self, parameter, field_format, offset):
+		field_struct = struct.Struct(field_format)
+		self._unpack_from = field_struct.unpack_from
+		self._pack_into = field_struct.pack_into
+		self._offset = offset
+		self._normalizer = parameter.valueNormalizer
+		# None and "" are replaced by the default, as in Structs
+		self._default = parameter.descriptor_type(parameter).default
+		if isinstance(parameter, EnumParameter):
+			self._members = tuple(parameter.choices)
+			self._ordinals = dict((member, ordinal) for ordinal, member in enumerate(self._members))
+		else:
+			self._members = None
+			self._ordinals = None
+
+	def __get__(self, view, owner):
+		if view is None:
+			return self
+		value = self._unpack_from(view._buffer, view._offset + self._offset)[0]
+		if self._members is not None:
+			return self._members[value]
+		return value
+
+	def __set__(self, view, value):
+		if value is None or value == "":
+			value = self._default()
+		else:
+			value = self._normalizer(value)
+		if self._ordinals is not None:
+			value = self._ordinals[value]
+		self._pack_into(view._buffer, view._offset + self._offset, value)
+
+class _RecordView(object):
+	"""
+	View of a record, whose attributes are read from and written to the buffer
+	"""
+	__slots__ = ["_buffer", "_offset"]
+	_codec = None
+
+	def __init__(self, buffer, offset):
+		self._buffer = buffer
+		self._offset = offset
+
+	def keys(self):
+		return [parameter.id for parameter in self._codec.type.__ATTRIBUTES__]
+
+	def __getitem__(self, key):
+		if not key in self.keys():
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def toStruct(self):
+		"""
+		Returns a copy of the record as an instance of the Struct
+		"""
+		return self._codec.unpack(self._buffer[self._offset:self._offset+self._codec.size])
+
+	def __eq__(self, other):
+		if isinstance(other, _RecordView):
+			other = other.toStruct()
+		return self.toStruct() == other
+
+	def __ne__(self, other):
+		return not (self == other)
+
+	def __repr__(self):
+		return "<%s record at %d>"%(self._codec.type.__name__, self._offset)
+
+def _viewType(codec):
+	# View class of the records of codec
+	namespace = dict(__slots__=[], _codec=codec)
+	for parameter, field_format, offset in codec._fields():
+		namespace[parameter.id] = _RecordField(parameter, field_format, offset)
+	return type("%sRecord"%codec.type.__name__, (_RecordView,), namespace)
+
+class StructRecordArray(object):
+	"""
+	Sequence of the records stored in a buffer, packed by a :class:`BinaryCodec`
+
+	:param codec: :class:`BinaryCodec` of the records, or Struct class to
+	              create one for
+	:param buffer: Object supporting the buffer protocol (``bytes``,
+	               ``bytearray``, ``mmap``...). Its size must be a multiple of
+	               the records' size
+	:raises: ValueError if the buffer's size does not match the records
+
+	Items are views reading and writing values in the buffer (if it is
+	writable). Values are normalized before they are written, as for Structs.
+	``toStruct()`` returns a standalone instance of a view's record.
+
+	::
+
+	  samples = StructRecordArray(codec, bytearray(codec.packMany(samples)))
+	  samples[-1].counter += 1
+	"""
+	def __init__(self, codec, buffer):
+		if not isinstance(codec, BinaryCodec):
+			codec = BinaryCodec(codec)
+		if len(buffer) % codec.size:
+			raise ValueError("StructRecordArray: buffer size (%d) is not a multiple of the records' size (%d)"%(len(buffer), codec.size))
+		self._codec = codec
+		self._buffer = buffer
+		self._view_type = _viewType(codec)
+
+	# ───────
+	# Methods
+
+	def __len__(self):
+		return len(self._buffer) // self._codec.size
+
+	def _offset(self, index):
+		length = len(self)
+		if index < 0:
+			index += length
+		if not 0 <= index < length:
+			raise IndexError("StructRecordArray index out of range")
+		return index * self._codec.size
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		return self._view_type(self._buffer, self._offset(index))
+
+	def __setitem__(self, index, instance):
+		offset = self._offset(index)
+		if isinstance(instance, dict):
+			instance = self._codec.type(**instance)
+		elif not isinstance(instance, self._codec.type):
+			raise TypeError("StructRecordArray: records are expected to be %s. %s received"%(self._codec.type, type(instance)))
+		self._buffer[offset:offset+self._codec.size] = self._codec.pack(instance)
+
+	def __iter__(self):
+		view_type = self._view_type
+		buffer = self._buffer
+		for offset in range(0, len(buffer), self._codec.size):
+			yield view_type(buffer, offset)
+
+	def toList(self):
+		"""
+		Returns all the records as instances of the Struct
+		"""
+		return self._codec.unpackMany(self._buffer)
+
+	# ──────────
+	# Properties
+
+	@property
+	def codec(self):
+		return self._codec
+
+	@property
+	def buffer(self):
+		return self._buffer
+
+class StructFile(StructRecordArray):
+	"""
+	:class:`StructRecordArray` of the records of a file, mapped in memory
+
+	:param path: Path of the file
+	:param codec: :class:`BinaryCodec` of the records, or Struct class to
+	              create one for
+	:param writable: Whether views can modify the file
+
+	Records are only read when accessed, so that any record of a large file
+	can be reached without loading the others. :meth:`write` creates such
+	files.
+
+	::
+
+	  StructFile.write("samples.bin", codec, samples)
+	  with StructFile("samples.bin", codec) as samples:
+	    print(samples[123456].value)
+	"""
+	def __init__(self, path, codec, writable=False):
+		with open(path, "r+b" if writable else "rb") as f:
+			if os.fstat(f.fileno()).st_size == 0:
+				# Empty files cannot be mapped
+				buffer = bytearray() if writable else b""
+			else:
+				buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+		StructRecordArray.__init__(self, codec, buffer)
+
+	@staticmethod
+	def write(path, codec, instances, append=False):
+		"""
+		Writes instances in a file of records
+
+		:param path: Path of the file
+		:param codec: :class:`BinaryCodec` of the records, or Struct class to
+		              create one for
+		:param instances: Iterable of instances of the Struct
+		:param append: Add the records at the end of the file instead of
+		               replacing it
+		"""
+		if not isinstance(codec, BinaryCodec):
+			codec = BinaryCodec(codec)
+		with open(path, "ab" if append else "wb") as f:
+			batch = []
+			for instance in instances:
+				batch.append(instance)
+				if len(batch) == _WRITE_BATCH:
+					f.write(codec.packMany(batch))
+					batch = []
+			f.write(codec.packMany(batch))
+
+	def flush(self):
+		"""
+		Writes the modified records to the file
+		"""
+		if isinstance(self._buffer, mmap.mmap):
+			self._buffer.flush()
+
+	def close(self):
+		"""
+		Unmaps the file. Views of its records must not be used anymore
+		"""
+		if isinstance(self._buffer, mmap.mmap):
+			self._buffer.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+__all__ = ["StructRecordArray", "StructFile"]
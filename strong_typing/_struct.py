@@ -31,17 +31,181 @@
 
 # Standard libraries
 import collections
+import copy
 from abc import ABCMeta
+import keyword
+import re
 import sys
 
 # Local modules
+from ._descriptors import ParameterDescriptor
 from ._textualize import TextualizeMixin
+from ._validation import state as _validation, ValidationLevel
+
+# ──────────────────────────── Compiled constructor ─────────────────────────── #
+
+# Marks the arguments that were not given to a compiled constructor
+_UNSET = object()
+
+_IDENTIFIER = re.compile(r"^[a-z][a-z0-9_]*$")
+
+_INIT_TEMPLATE = """
+def __init__(_self, %(signature)s*_args, **_kwargs):
+	if _validation.level is _FULL:
+		pass%(body)s
+	else:
+		_setGiven(_self, _ids, (%(values)s))
+	if _args:
+		raise TypeError(_tooManyArguments(%(count)d, %(count)d+_len(_args)))
+	for _key, _value in _kwargs.items():
+		try:
+			_setattr(_self, _key, _value)
+		except AttributeError:
+			raise TypeError(_unexpectedKeyword(_key))
+"""
+
+_PARAMETER_TEMPLATE = """
+		if %(id)s is not _UNSET:
+			if %(id)s is None or %(id)s == "":
+				_set_%(index)d(_self, _default_%(index)d())
+			else:
+				_set_%(index)d(_self, _normalize_%(index)d(%(id)s))
+"""
+
+def _tooManyArguments(expected, given):
+	msg = "__init__() takes "
+	msg += "no " if expected==0 else "at most %d "%expected
+	msg += "arguments (%d given)"%given
+	return msg
+
+def _unexpectedKeyword(key):
+	return "__init__() got an unexpected keyword argument '%s'"%key
+
+def _setGiven(instance, ids, values):
+	# Used by compiled constructors when values must not be fully validated:
+	# the parameters' descriptors then apply the current validation level
+	for id, value in zip(ids, values):
+		if value is not _UNSET:
+			setattr(instance, id, value)
+
+def _givenTwice(cls, args, kwargs):
+	# Tells if a parameter is given both by position and by keyword
+	for parameter in cls.__ATTRIBUTES__[:len(args)]:
+		if parameter.id in kwargs:
+			return True
+	return False
+
+def _findDescriptor(cls, id):
+	for klass in cls.__mro__:
+		if id in klass.__dict__:
+			return klass.__dict__[id]
+
+def _overrides(cls, name):
+	# Tells if ``cls`` (or one of its parents) redefines a method of Struct
+	for klass in cls.__mro__:
+		if klass is Struct:
+			return False
+		if name in klass.__dict__:
+			return True
+	return False
+
+def _compileInit(cls):
+	"""
+	Generates a constructor dedicated to the parameters of ``cls``
+
+	Each parameter becomes a real argument of the constructor, whose value is
+	normalized and stored directly in its slot, without going through
+	``__setattr__`` and the parameter's descriptor. Extra arguments are handled
+	as in the generic constructor, so errors are reported the same way.
+
+	Values are only normalized at the ``FULL`` validation level. Otherwise,
+	they are assigned through the descriptors which apply the current level.
+
+	The constructor is only called by ``StructMeta.__call__`` for instances of
+	exactly ``cls``: ``cls.__init__`` stays the generic one, which subclasses
+	reach with ``super()``. It is not called either when a parameter is given
+	both by position and by keyword, as the generic constructor accepts it (the
+	keyword wins).
+
+	Returns ``None`` if the class defines its own ``__init__``, ``__new__`` or
+	``__setattr__``, if the parameters' ids cannot be used as argument names or
+	if a parameter has no normalizer, in which case the generic constructor
+	must be used.
+	"""
+	for name in ["__init__", "__new__", "__setattr__"]:
+		if _overrides(cls, name):
+			return None
+	ids = [parameter.id for parameter in cls.__ATTRIBUTES__]
+	for id in ids:
+		if _IDENTIFIER.match(id) is None or keyword.iskeyword(id):
+			return None
+	if len(set(ids)) != len(ids):
+		return None
+
+	namespace = dict(_UNSET=_UNSET,
+	                 _FULL=ValidationLevel.FULL,
+	                 _validation=_validation,
+	                 _ids=ids,
+	                 _setGiven=_setGiven,
+	                 # Builtins are renamed, as parameters may hide them
+	                 _len=len,
+	                 _setattr=setattr,
+	                 _tooManyArguments=_tooManyArguments,
+	                 _unexpectedKeyword=_unexpectedKeyword)
+	body = ""
+	for index, parameter in enumerate(cls.__ATTRIBUTES__):
+		descriptor = _findDescriptor(cls, parameter.id)
+		if not isinstance(descriptor, ParameterDescriptor):
+			return None
+		try:
+			namespace["_normalize_%d"%index] = parameter.valueNormalizer
+		except NotImplementedError:
+			return None
+		namespace["_default_%d"%index] = descriptor.default
+		namespace["_set_%d"%index] = descriptor.slot.__set__
+		body += _PARAMETER_TEMPLATE%dict(id=parameter.id, index=index)
+
+	source = _INIT_TEMPLATE%dict(signature="".join("%s=_UNSET, "%id for id in ids),
+	                             values="".join("%s, "%id for id in ids),
+	                             body=body,
+	                             count=len(ids))
+	exec(compile(source, "<%s.__init__>"%cls.__name__, "exec"), namespace)
+	return namespace["__init__"]
+
+def _copyInstance(cls, other):
+	"""
+	Copies the parameters of ``other``, an instance of exactly ``cls``
+
+	Values are read from and written to the slots directly. They are already
+	valid for their parameter, so each one is only cloned as its parameter
+	requires (nested structs and typed lists are copied, immutable values are
+	shared). Parameters never accessed in ``other`` stay unset and will get
+	their default on first access.
+	"""
+	instance = cls.__new__(cls)
+	for slot, copy_value in cls.__SLOT_COPIERS__:
+		try:
+			value = slot.__get__(other, cls)
+		except AttributeError:
+			continue
+		slot.__set__(instance, copy_value(value))
+	return instance
+
+# ─────────────────────────────────── Struct ────────────────────────────────── #
+
+class _InstanceDoc(object):
+	# Gives instances the documentation of their class, which is built by
+	# StructMeta on first access (the class' own __doc__ entry would hide it)
+
+	def __get__(self, instance, owner):
+		return owner.__doc__
 
 class StructMeta(ABCMeta):
 
 	def __new__(mcs, name, bases, attrs, **kwargs):
 		# Prepare __slots__
 		attrs["__slots__"]=[]
+		attrs["__doc__"] = _InstanceDoc()
 
 		# If some parameters are defined
 		if "__ATTRIBUTES__" in attrs.keys():
@@ -50,44 +214,42 @@ class StructMeta(ABCMeta):
 				# Create a slot for each
 				attrs["__slots__"].append("_"+parameter.id)
 
-				# And create a descriptor class to handle their
-				# get/set/default/doc based on parameter description
-				class Descriptor(object):
-					__doc__ ="""%s
-
-					Default: %s
-
-					"""%(parameter.description,\
-					    str(parameter.default) if parameter.default != "" else "\"\"")
+				# And a descriptor to handle their get/set/default/doc
+				# based on parameter description
+				attrs[parameter.id] = parameter.descriptor_type(parameter)
 
-					__slots__ = ["_parameter"]
+		cls = ABCMeta.__new__(mcs, name, bases, attrs)
 
-					def __init__(self, parameter):
-						self._parameter = parameter
+		# Descriptors can only access the slots once they are created
+		if "__ATTRIBUTES__" in attrs.keys():
+			for parameter in attrs["__ATTRIBUTES__"]:
+				attrs[parameter.id].bind(cls.__dict__["_"+parameter.id])
 
-					def __get__(self, instance, owner):
-						if instance is not None:
-							try:
-								return getattr(instance, "_"+self._parameter.id)
-							except AttributeError:
-								setattr(instance, "_"+self._parameter.id, self._parameter.normalizer(self._parameter.default))
-								return getattr(instance, "_"+self._parameter.id)
-						else:
-							return self._parameter
+		# Names accepted by __setattr__, gathered once for constant-time checks
+		cls.__ATTRIBUTE_IDS__ = frozenset(parameter.id for parameter in cls.__ATTRIBUTES__)
+		cls.__SLOT_NAMES__ = frozenset("_"+id for id in cls.__ATTRIBUTE_IDS__)
 
-					def __set__(self, instance, value):
-						new_value = value if value is not None and value != "" else self._parameter.default
-						new_value = self._parameter.normalizer(new_value)
-						return setattr(instance, "_"+self._parameter.id, new_value)
+		# Slots of the parameters, in the order of __ATTRIBUTES__, and their
+		# setters by id
+		cls.__PARAMETER_SLOTS__ = tuple(getattr(cls, "_"+parameter.id) for parameter in cls.__ATTRIBUTES__)
+		cls.__SLOT_SETTERS__ = dict((parameter.id, slot.__set__) for parameter, slot in zip(cls.__ATTRIBUTES__, cls.__PARAMETER_SLOTS__))
+		cls.__SLOT_COPIERS__ = tuple((slot, parameter.copyValue) for parameter, slot in zip(cls.__ATTRIBUTES__, cls.__PARAMETER_SLOTS__))
 
-					def __delete__(self, instance):
-						return setattr(instance, "_"+self._parameter.id, self._parameter.normalizer(self._parameter.default))
+		# Constructor dedicated to this class' parameters, compiled on first
+		# instantiation
+		cls.__COMPILED_INIT__ = _UNSET
 
-				attrs[parameter.id] = Descriptor(parameter)
+		return cls
 
-		return ABCMeta.__new__(mcs, name, bases, attrs)
+	@property
+	def __doc__(cls):
+		# The documentation textualizes all default values, so it is only built
+		# when requested (by help(), Sphinx, ...) and then kept
+		if not "_StructMeta__doc" in cls.__dict__:
+			cls.__doc = cls._buildDoc()
+		return cls.__doc
 
-	def __init__(cls, name, bases, attrs, **kwargs):
+	def _buildDoc(cls):
 		docu = "%s\n\n"%cls.__DESCRIPTION__
 		docu += ":Parameters:\n\n"
 		for parameter in cls.__ATTRIBUTES__:
@@ -98,17 +260,32 @@ class StructMeta(ABCMeta):
 			default_string += "``" if not isinstance(parameter.default, Struct) else ""
 			docu += "\t\tDefault: %s\n\n"%default_string
 
-		cls.__doc__ = docu
+		return docu
 
 	def __call__(cls, *args, **kwargs):
+		init = cls.__COMPILED_INIT__
+		if init is _UNSET:
+			init = _compileInit(cls)
+			cls.__COMPILED_INIT__ = init
+
 		# Copy constructor
 		if len(args) == 1 and isinstance(args[0], cls):
+			# Values of an instance of the very same class can be copied slot
+			# by slot, unless a custom constructor must see them
+			if type(args[0]) is cls and not (_overrides(cls, "__init__") or _overrides(cls, "__setattr__")):
+				return _copyInstance(cls, args[0])
 			kwargs = args[0]
 			args = []
-		return type.__call__(cls, *args, **kwargs)
+
+		if init is None or (args and kwargs and _givenTwice(cls, args, kwargs)):
+			return type.__call__(cls, *args, **kwargs)
+		instance = object.__new__(cls)
+		init(instance, *args, **kwargs)
+		return instance
 
 class Struct(collections.Mapping, TextualizeMixin):
 	__metaclass__=StructMeta
+	__slots__ = []
 	__ATTRIBUTES__ = []
 	__DESCRIPTION__ = ""
 
@@ -117,26 +294,98 @@ class Struct(collections.Mapping, TextualizeMixin):
 			try:
 				setattr(self, self.__ATTRIBUTES__[i].id, args[i])
 			except IndexError:
-				msg = "__init__() takes "
-				msg += "no " if len(self.__ATTRIBUTES__)==0 else "at most %d "%len(self.__ATTRIBUTES__)
-				msg += "arguments (%d given)"%len(args)
-				raise TypeError(msg)
+				raise TypeError(_tooManyArguments(len(self.__ATTRIBUTES__), len(args)))
 		for key, value in kwargs.items():
 			try:
 				setattr(self, key, value)
 			except AttributeError as e:
-				msg = "__init__() got an unexpected keyword argument '%s'"%key
-				raise TypeError(msg)
+				raise TypeError(_unexpectedKeyword(key))
+
+	@classmethod
+	def _fromTrusted(cls, values):
+		"""
+		Creates an instance from values that are known to be normalized
+
+		:param values: Mapping of parameters' ids to values, or sequence of
+		               values in the order of ``__ATTRIBUTES__``
+		:raises: TypeError if a value does not match any parameter
+
+		Values are written in the slots as they are, without any check. This
+		must only be used on data produced by the application itself (e.g.
+		deserialization of its own files), and never on user inputs.
+		"""
+		instance = cls.__new__(cls)
+		if isinstance(values, collections.Mapping):
+			setters = cls.__SLOT_SETTERS__
+			try:
+				for key in values:
+					setters[key](instance, values[key])
+			except KeyError:
+				raise TypeError(_unexpectedKeyword(key))
+		else:
+			values = tuple(values)
+			if len(values) > len(cls.__PARAMETER_SLOTS__):
+				raise TypeError(_tooManyArguments(len(cls.__PARAMETER_SLOTS__), len(values)))
+			for slot, value in zip(cls.__PARAMETER_SLOTS__, values):
+				slot.__set__(instance, value)
+		return instance
+
+	def toJson(self, **kwargs):
+		"""
+		Serializes the instance to a JSON string
+
+		:param kwargs: Extra arguments of ``json.dumps`` (e.g. ``indent``)
+		"""
+		from ._json import dumps
+		return dumps(self, **kwargs)
+
+	@classmethod
+	def fromJson(cls, text):
+		"""
+		Creates an instance from a JSON string produced by :meth:`toJson`
+
+		:param text: JSON string
+		:raises: TypeError if a key does not match any parameter
+
+		Like :meth:`_fromTrusted`, values are not normalized again, and this
+		must not be used on user inputs.
+		"""
+		from ._json import loads
+		return loads(cls, text)
+
+	def __copy__(self):
+		cls = self.__class__
+		instance = cls.__new__(cls)
+		for slot in cls.__PARAMETER_SLOTS__:
+			try:
+				slot.__set__(instance, slot.__get__(self, cls))
+			except AttributeError:
+				pass
+		return instance
+
+	def __deepcopy__(self, memo):
+		cls = self.__class__
+		instance = cls.__new__(cls)
+		memo[id(self)] = instance
+		for slot in cls.__PARAMETER_SLOTS__:
+			try:
+				value = slot.__get__(self, cls)
+			except AttributeError:
+				continue
+			slot.__set__(instance, copy.deepcopy(value, memo))
+		return instance
 
 	def __getitem__(self, key):
 		return getattr(self, key)
 
 	def __setattr__(self, name, value):
-		keys = list(self.keys())
-		if (not name in keys) and (not name[1:] in keys):
+		if (not name in self.__ATTRIBUTE_IDS__) and (not name in self.__SLOT_NAMES__):
 			raise AttributeError("%s object has no attribute %s"%(self.__class__.__name__, name))
 		object.__setattr__(self, name, value)
 
+	def __contains__(self, key):
+		return key in self.__ATTRIBUTE_IDS__
+
 	def __iter__(self):
 		for attr in self.__ATTRIBUTES__:
 			yield attr.id
@@ -30,6 +30,15 @@
 
 # Standard libraries
 import collections
+import contextlib
+import io
+import sys
+
+if sys.version_info >= (3,0):
+	unicode = str
+else:
+	# Keys of long sequences are only created when written
+	range = xrange
 
 # ─────────────────────
 # Formatting parameters
@@ -47,40 +56,198 @@ TREE_INDENT=lambda x: unicodeWithAsciiFallback(u'─', '-', x)*(INDENT_SIZE-2) +
 TREE_MID_INDENT=lambda x: unicodeWithAsciiFallback(u'├', '|', x) + TREE_INDENT(x)
 TREE_LAST_INDENT=lambda x: unicodeWithAsciiFallback(u'└', '|', x) + TREE_INDENT(x)
 
-def textualize_mapping(mapping, display_type=str):
+# Replaces what is not written when a limit is reached
+ELISION = "..."
+ELIDED_ITEMS = ELISION + " (%d more items)"
+
+# ──────
+# Limits
+
+class TextualizeLimits(object):
+	"""
+	Bounds of the text of a structure. ``None`` means unlimited.
+
+	:param max_depth: Number of nesting levels written. Deeper Structs and
+	                  lists are replaced by ``{...}`` and ``[...]``
+	:param max_items: Number of items written per list. The others are
+	                  replaced by a last line giving their number
+	:param max_length: Length of the text. Writing stops when it is reached,
+	                   and the text ends with ``...``
+	"""
+	__slots__ = ["max_depth", "max_items", "max_length"]
+
+	def __init__(self, max_depth=None, max_items=None, max_length=None):
+		self.max_depth = max_depth
+		self.max_items = max_items
+		self.max_length = max_length
+
+	def __repr__(self):
+		return "TextualizeLimits(max_depth=%r, max_items=%r, max_length=%r)"%(self.max_depth, self.max_items, self.max_length)
+
+# Used by str() and unicode()
+default_limits = TextualizeLimits()
+
+def getTextualizeLimits():
+	"""
+	Returns the :class:`TextualizeLimits` used by ``str()``
+	"""
+	return TextualizeLimits(default_limits.max_depth, default_limits.max_items, default_limits.max_length)
+
+def setTextualizeLimits(max_depth=None, max_items=None, max_length=None):
+	"""
+	Sets the :class:`TextualizeLimits` used by ``str()`` in the whole process
+
+	Without argument, structures are entirely written again.
+	"""
+	default_limits.max_depth = max_depth
+	default_limits.max_items = max_items
+	default_limits.max_length = max_length
+
+@contextlib.contextmanager
+def textualizeLimits(max_depth=None, max_items=None, max_length=None):
+	"""
+	Context manager changing the :class:`TextualizeLimits` in its scope
+
+	The limits are process-wide: other threads are affected too while in the
+	scope.
+	"""
+	previous_limits = getTextualizeLimits()
+	setTextualizeLimits(max_depth, max_items, max_length)
+	try:
+		yield
+	finally:
+		setTextualizeLimits(previous_limits.max_depth, previous_limits.max_items, previous_limits.max_length)
+
+# ───────
+# Writing
+
+# Number of characters written at once by TextualizeMixin.writeTo
+_CHUNK_SIZE = io.DEFAULT_BUFFER_SIZE
+
+def textualize_mapping(mapping, display_type=str, limits=None):
 	"""
 	Pretty print of mappings
 
 	:param mapping: Mapping to display
 	:param display_type: Output type ("str" or "unicode", "str" is default)
+	:param limits: :class:`TextualizeLimits` of the text (unlimited by default)
 	"""
-	return textualize(list(mapping.keys()), mapping, display_type)
+	return textualize(list(mapping.keys()), mapping, display_type, limits)
 
-def textualize_sequence(sequence, display_type=str):
+def textualize_sequence(sequence, display_type=str, limits=None):
 	"""
 	Pretty print of sequence
 
 	:param sequence: Sequence to display
 	:param display_type: Output type ("str" or "unicode", "str" is default)
+	:param limits: :class:`TextualizeLimits` of the text (unlimited by default)
 	"""
-	return textualize(range(len(sequence)), sequence, display_type)
-
-def textualize(keys, map, display_type):
-	res_str = ""
-	for key in keys:
-		value = map[key]
-		value = value if value != "" else "\"\""
-		if key != keys[-1]:
-			res_str += "\n" + TREE_MID_INDENT(display_type)
-			indent_level = AFTER_MID_INDENT(display_type)
+	return textualize(None, sequence, display_type, limits)
+
+def textualize(keys, map, display_type, limits=None):
+	# keys is None for sequences, whose keys are their indices
+	return "".join(_iterPieces(keys, map, display_type, limits))
+
+def _iterPieces(keys, map, display_type, limits):
+	# Returns an iterator on the text of the given items, in pieces
+	pieces = _iterItems(keys if keys is None else list(keys), map, display_type, limits)
+	max_length = None if limits is None else limits.max_length
+	if max_length is None:
+		return pieces
+	return _cut(pieces, max_length)
+
+def _cut(pieces, max_length):
+	# Yields the pieces that fit in max_length. If the text is longer, the
+	# last pieces are kept until it is known, and then cut to end with the
+	# elision marker.
+	limit = max(max_length - len(ELISION), 0)
+	length = 0
+	pending = []
+	pending_length = 0
+	for piece in pieces:
+		if not pending and length + len(piece) <= limit:
+			length += len(piece)
+			yield piece
+		else:
+			pending.append(piece)
+			pending_length += len(piece)
+			if length + pending_length > max_length:
+				yield "".join(pending)[:limit-length] + ELISION
+				return
+	if pending:
+		yield "".join(pending)
+
+class _Items(object):
+	"""
+	Items of a mapping or a sequence being written
+	"""
+	__slots__ = ["map", "items", "last_index", "elided", "depth", "nested",
+	             "mid_prefix", "last_prefix", "after_mid_indent", "after_last_indent"]
+
+	def __init__(self, keys, map, indent, depth, prefixes, limits):
+		mid_prefix, last_prefix, after_mid_indent, after_last_indent = prefixes
+		self.map = map
+		self.mid_prefix = "\n" + indent + mid_prefix
+		self.last_prefix = "\n" + indent + last_prefix
+		self.after_mid_indent = indent + after_mid_indent
+		self.after_last_indent = indent + after_last_indent
+
+		self.elided = 0
+		if keys is None:
+			keys_count = len(map)
+			if limits is not None and limits.max_items is not None:
+				self.elided = max(keys_count - limits.max_items, 0)
+			keys = range(keys_count - self.elided)
+		self.items = enumerate(keys)
+		self.last_index = len(keys) - 1 if not self.elided else -1
+		self.depth = depth
+		self.nested = limits is None or limits.max_depth is None or depth < limits.max_depth
+
+def _iterItems(keys, map, display_type, limits):
+	# Yields the tree of the given items in pieces, each line after a newline
+	# and its indent. Nested textualized values are written in the same pass,
+	# instead of being textualized on their own and then indented. They are
+	# stacked rather than given to recursive generators, so that pieces are
+	# not yielded again at each level.
+	prefixes = (TREE_MID_INDENT(display_type),
+	            TREE_LAST_INDENT(display_type),
+	            AFTER_MID_INDENT(display_type),
+	            AFTER_LAST_INDENT(display_type))
+	stack = [_Items(keys, map, "", 1, prefixes, limits)]
+	while stack:
+		items = stack[-1]
+		for index, key in items.items:
+			value = items.map[key]
+			if index != items.last_index:
+				prefix = items.mid_prefix + display_type(key) + ": "
+				value_indent = items.after_mid_indent
+			else:
+				prefix = items.last_prefix + display_type(key) + ": "
+				value_indent = items.after_last_indent
+
+			if _isTextualized(value, display_type):
+				is_mapping = isinstance(value, collections.Mapping)
+				if len(value) == 0:
+					yield prefix + ("{}" if is_mapping else "[]")
+				elif not items.nested:
+					yield prefix + ("{%s}"%ELISION if is_mapping else "[%s]"%ELISION)
+				else:
+					yield prefix
+					stack.append(_Items(list(value.keys()) if is_mapping else None,
+					                    value, value_indent, items.depth+1, prefixes, limits))
+					# Continued once the nested items are written
+					break
+			else:
+				value = value if value != "" else "\"\""
+				yield prefix + display_type(value).replace("\n", "\n"+value_indent)
 		else:
-			res_str += "\n" + TREE_LAST_INDENT(display_type)
-			indent_level = AFTER_LAST_INDENT(display_type)
-		res_str += display_type(key) + ": "
-		res_str += display_type(value).replace("\n","\n"+(indent_level))
-	return res_str
+			stack.pop()
+			if items.elided:
+				yield items.last_prefix + ELIDED_ITEMS%items.elided
 
 class TextualizeMixin(object):
+	__slots__ = []
+
 	def __getitem__(self, key):
 		raise NotImplementedError
 
@@ -93,16 +260,104 @@ class TextualizeMixin(object):
 	def __unicode__(self):
 		return self._textualize(unicode)
 
-	def _textualize(self, display_type):
+	def textualize(self, max_depth=None, max_items=None, max_length=None, display_type=str):
+		"""
+		Returns the text of the structure, within the given limits
+
+		:param max_depth: Number of nesting levels written
+		:param max_items: Number of items written per list
+		:param max_length: Length of the text
+		:param display_type: Output type (``str`` or ``unicode``)
+
+		See :class:`TextualizeLimits`. ``str()`` uses the limits set with
+		:func:`setTextualizeLimits` (none by default).
+		"""
+		return self._textualize(display_type, TextualizeLimits(max_depth, max_items, max_length))
+
+	def iterLines(self, max_depth=None, max_items=None, max_length=None, display_type=str):
+		"""
+		Yields the lines of the text of the structure, within the given limits
+
+		Lines are built while iterating. Joined with ``"\\n"``, they give the
+		text returned by :meth:`textualize` (whose first line is empty).
+		"""
+		line = []
+		for piece in self._iterText(display_type, TextualizeLimits(max_depth, max_items, max_length)):
+			if not "\n" in piece:
+				line.append(piece)
+				continue
+			parts = piece.split("\n")
+			line.append(parts[0])
+			yield "".join(line)
+			for part in parts[1:-1]:
+				yield part
+			line = [parts[-1]]
+		yield "".join(line)
+
+	def writeTo(self, stream, max_depth=None, max_items=None, max_length=None, display_type=str):
+		"""
+		Writes the text of the structure in a stream, within the given limits
+
+		:param stream: Object with a ``write`` method (file, socket file...)
+
+		The text is written by chunks while it is built, instead of being
+		built entirely first.
+		"""
+		chunk = []
+		chunk_length = 0
+		for piece in self._iterText(display_type, TextualizeLimits(max_depth, max_items, max_length)):
+			chunk.append(piece)
+			chunk_length += len(piece)
+			if chunk_length >= _CHUNK_SIZE:
+				stream.write("".join(chunk))
+				chunk = []
+				chunk_length = 0
+		if chunk:
+			stream.write("".join(chunk))
+
+	def _textualize(self, display_type, limits=None):
+		return "".join(self._iterText(display_type, limits))
+
+	def _iterText(self, display_type, limits=None):
+		# Returns an iterator on the text, in pieces
+		if limits is None:
+			limits = default_limits
 		if isinstance(self, collections.Mapping):
 			if len(self) == 0:
-				return "{}"
-			return textualize_mapping(self, display_type)
+				return iter(["{}"])
+			return _iterPieces(list(self.keys()), self, display_type, limits)
 		elif isinstance(self, collections.Sequence):
 			if len(self) == 0:
-				return "[]"
-			return textualize_sequence(self, display_type)
+				return iter(["[]"])
+			return _iterPieces(None, self, display_type, limits)
 		else:
 			raise Exception("Only collections.{Sequence,Mapping} are supported")
 
-__all__=["TextualizeMixin"]
\ No newline at end of file
+def _function(method):
+	# Python 2 returns unbound methods, that are different at each access
+	return getattr(method, "__func__", method)
+
+_MIXIN_STR = _function(TextualizeMixin.__str__)
+_MIXIN_UNICODE = _function(TextualizeMixin.__unicode__)
+_MIXIN_TEXTUALIZE = _function(TextualizeMixin._textualize)
+
+def _isTextualized(value, display_type):
+	# Whether display_type(value) would be textualized by TextualizeMixin
+	if not isinstance(value, TextualizeMixin):
+		return False
+	elif not isinstance(value, (collections.Mapping, collections.Sequence)):
+		return False
+	value_type = type(value)
+	if _function(value_type._textualize) is not _MIXIN_TEXTUALIZE:
+		return False
+	elif display_type is str:
+		return _function(value_type.__str__) is _MIXIN_STR
+	elif display_type is unicode:
+		return _function(value_type.__unicode__) is _MIXIN_UNICODE
+	return False
+
+__all__=["TextualizeMixin",
+         "TextualizeLimits",
+         "getTextualizeLimits",
+         "setTextualizeLimits",
+         "textualizeLimits"]
\ No newline at end of file
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Process-wide control of the checks done when a Struct's parameter is set
+"""
+
+# Standard libraries
+import contextlib
+
+# Third-party libraries
+import enum
+
+class ValidationLevel(enum.Enum):
+	"""
+	Checks done on the values assigned to Structs' parameters
+
+	``FULL``
+		Values are normalized by their parameter (default behavior)
+	``TRUSTED``
+		Values are considered already normalized and stored as they are.
+		``None`` and ``""`` still reset the parameter to its default value
+	``OFF``
+		Values are stored as they are, without any exception
+	"""
+	FULL = "full"
+	TRUSTED = "trusted"
+	OFF = "off"
+
+class _ValidationState(object):
+	__slots__ = ["level"]
+
+	def __init__(self):
+		self.level = ValidationLevel.FULL
+
+# Read by the descriptors and compiled constructors on each assignment
+state = _ValidationState()
+
+def getValidationLevel():
+	"""
+	Returns the current :class:`ValidationLevel`
+	"""
+	return state.level
+
+def setValidationLevel(level):
+	"""
+	Sets the :class:`ValidationLevel` used by the whole process
+
+	:param level: A :class:`ValidationLevel` or its value ("full", "trusted", "off")
+	"""
+	state.level = ValidationLevel(level)
+
+@contextlib.contextmanager
+def validationLevel(level):
+	"""
+	Context manager changing the :class:`ValidationLevel` in its scope
+
+	The level is process-wide: other threads are affected too while in the
+	scope.
+
+	:Example:
+		>>> with validationLevel(ValidationLevel.TRUSTED):
+		...     messages = [Message(**fields) for fields in stored_messages]
+	"""
+	previous_level = state.level
+	setValidationLevel(level)
+	try:
+		yield
+	finally:
+		state.level = previous_level
+
+__all__=["ValidationLevel", "getValidationLevel", "setValidationLevel", "validationLevel"]
@@ -29,15 +29,138 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 # Standard library
-from distutils.version import StrictVersion
+import re
+import sys
 
 # Local modules
+from ._migrations import _compileMigration, Drop
 from ._struct import StructMeta, Struct
 
+if sys.version_info >= (3,0):
+	unicode = str
+
+_VERSION_PATTERN = re.compile(r"^(\d+)\.(\d+)(?:\.(\d+))?(?:([ab])(\d+))?$")
+
+class Version(tuple):
+	"""
+	Version number, comparable as a tuple
+
+	Versions have the format of ``distutils``' ``StrictVersion``: two or
+	three numbers, optionally followed by a pre-release tag (``1.0``,
+	``1.2.3``, ``2.0b1``...). They can be compared to each other, or to
+	strings.
+
+	Equal versions have the same hash, but a version does not hash like the
+	strings it is equal to (``"1.0"`` and ``"1.0.0"`` are both equal to
+	``Version.parse("1.0")``): versions and strings must not be mixed as keys
+	of a dict or in a set.
+
+	Use :meth:`parse` to create them: each version string is only parsed once.
+	"""
+	# Parsed versions, by string
+	_parsed = dict()
+
+	@staticmethod
+	def parse(version):
+		"""
+		Returns the :class:`Version` of a string
+
+		:raises: ValueError if the string is not a valid version number
+		"""
+		if isinstance(version, Version):
+			return version
+		try:
+			return Version._parsed[version]
+		except (KeyError, TypeError):
+			pass
+		match = _VERSION_PATTERN.match(str(version))
+		if match is None:
+			raise ValueError("invalid version number '%s'"%version)
+		major, minor, patch, tag, tag_number = match.groups()
+		# Pre-releases come before the release ((0, tag) < (1, ""))
+		result = tuple.__new__(Version, (int(major),
+		                                 int(minor),
+		                                 int(patch or 0),
+		                                 0 if tag else 1,
+		                                 tag or "",
+		                                 int(tag_number or 0)))
+		try:
+			return Version._parsed.setdefault(version, result)
+		except TypeError:
+			# Unhashable input
+			return result
+
+	# ──────────
+	# Properties
+
+	@property
+	def version(self):
+		"""
+		Numbers of the version, as a tuple of three integers
+		"""
+		return self[:3]
+
+	@property
+	def prerelease(self):
+		"""
+		Pre-release tag and number, or None for a release
+		"""
+		return None if self[3] else (self[4], self[5])
+
+	# ─────────
+	# Operators
+
+	def __str__(self):
+		text = "%d.%d"%self[:2] if self[2] == 0 else "%d.%d.%d"%self[:3]
+		if not self[3]:
+			text += "%s%d"%self[4:]
+		return text
+
+	def __repr__(self):
+		return "Version('%s')"%str(self)
+
+	def __eq__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__eq__(self, other)
+
+	def __ne__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__ne__(self, other)
+
+	def __lt__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__lt__(self, other)
+
+	def __le__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__le__(self, other)
+
+	def __gt__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__gt__(self, other)
+
+	def __ge__(self, other):
+		other = _comparable(other)
+		return NotImplemented if other is None else tuple.__ge__(self, other)
+
+	__hash__ = tuple.__hash__
+
+def _comparable(other):
+	# Returns other as a Version, if it is a version or a version string
+	if isinstance(other, Version):
+		return other
+	elif isinstance(other, (str, unicode)) or hasattr(other, "prerelease"):
+		# Strings, or distutils' StrictVersion
+		return Version.parse(str(other))
+	return None
+
 class VersionedStructMeta(StructMeta):
 
-	def __init__(cls, name, bases, attrs, **kwargs):
-		docu = "%s (current version: %s):\n\n"%(name, cls.__VERSION__)
+	# Every class body defines __doc__, so the lazy one must be inherited explicitly
+	__doc__ = StructMeta.__dict__["__doc__"]
+
+	def _buildDoc(cls):
+		docu = "%s (current version: %s):\n\n"%(cls.__name__, cls.__VERSION__)
 		docu += "Description: %s\n\n"%cls.__DESCRIPTION__
 		docu += ":Parameters:\n\n"
 		for parameter, version in zip(cls.__ATTRIBUTES__,cls.__ATT_VERSIONS__):
@@ -49,42 +172,92 @@ class VersionedStructMeta(StructMeta):
 			docu += "\t\tDefault: %s\n\n"%default_string
 
 		if len(cls.__DEPRECATED_ATT_N_VERSIONS__) == 0:
-			cls.__doc__ = docu
-			return
+			return docu
 
 		docu+=":Deprecated parameters:\n\n"
 		for parameter, first_version, last_version in cls.__DEPRECATED_ATT_N_VERSIONS__:
 			docu += "\t``%s`` %s%s\n\n"%(parameter.id,\
-			                             "" if first_version is None else " (appeared in version %s)"%version,\
+			                             "" if first_version is None else " (appeared in version %s)"%first_version,\
 			                             " (deprecated since version %s)"%last_version)
 			docu += "\t\t%s\n\n"%parameter.description
 			default_string = unicode(parameter.default).replace("\n","\n\n\t\t\t") if parameter.default != "" else "\"\""
 			docu += "\t\tDefault: %s\n\n"%default_string
-		cls.__doc__ = docu
+		return docu
 
 	@property
 	def version(cls):
-		return StrictVersion(cls.__VERSION__)
+		return Version.parse(cls.__VERSION__)
 
 class VersionedStruct(Struct):
 	__metaclass__= VersionedStructMeta
+	__slots__ = []
 	__VERSION__="1.0"
 	__DESCRIPTION__ = ""
 	__ATTRIBUTES__ = []
 	__ATT_VERSIONS__ = []
 	__DEPRECATED_ATT_N_VERSIONS__ = []
+	# Migration steps to each version from the previous one, by version
+	__MIGRATIONS__ = dict()
 
 	@classmethod
 	def fromDict(cls, data=dict()):
 		if "version" in data.keys():
-			version = StrictVersion(data.pop("version"))
-			if version < cls.version:
-				return cls._fromOldDict(data, version)
+			return cls._migrationPlan(data.pop("version"))(data)
 
 		return cls(**data)
 
+	@classmethod
+	def _migrationPlan(cls, version):
+		# Returns the function creating an instance from the data of a given
+		# version. It is only resolved once per class and version.
+		plans = cls.__dict__.get("__MIGRATION_PLANS__")
+		if plans is None:
+			plans = dict()
+			cls.__MIGRATION_PLANS__ = plans
+		try:
+			return plans[version]
+		except (KeyError, TypeError):
+			pass
+
+		parsed_version = Version.parse(version)
+		if parsed_version >= cls.version:
+			def plan(data):
+				return cls(**data)
+		elif not cls.__MIGRATIONS__ and hasattr(cls, "_fromOldDict"):
+			# Hand-written migration
+			def plan(data):
+				return cls._fromOldDict(data, parsed_version)
+		else:
+			plan = _compileMigration(cls._migrationSteps(parsed_version),
+			                         cls,
+			                         "%s migration from %s"%(cls.__name__, version))
+		try:
+			return plans.setdefault(version, plan)
+		except TypeError:
+			return plan
+
+	@classmethod
+	def _migrationSteps(cls, version):
+		# Returns the steps bringing data of an older version up to date: the
+		# ones of every newer version, then the removal of deprecated
+		# parameters
+		migrations = sorted([(Version.parse(target), steps) for target, steps in cls.__MIGRATIONS__.items()],
+		                    key=lambda migration: migration[0])
+		result = []
+		for target, steps in migrations:
+			if version < target <= cls.version:
+				result.extend(steps)
+		ids = set(parameter.id for parameter in cls.__ATTRIBUTES__)
+		for parameter, first_version, last_version in cls.__DEPRECATED_ATT_N_VERSIONS__:
+			if not parameter.id in ids and version < Version.parse(last_version):
+				result.append(Drop(parameter.id))
+		return result
+
 	@property
 	def version(self):
-		return StrictVersion(self.__VERSION__)
+		return Version.parse(self.__VERSION__)
+
+if sys.version_info >= (3,0):
+	from ._versioned_struct_v3 import VersionedStruct
 
-__all__=["VersionedStruct"]
\ No newline at end of file
+__all__=["Version", "VersionedStruct"]
\ No newline at end of file
@@ -32,4 +32,6 @@
 Overrides the built-in containers to constrain contained element types
 """
 
-from ._typed_list import TypedList
\ No newline at end of file
+from ._typed_array import TypedArray
+from ._typed_list import TypedList
+from ._struct_array import StructArray
@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard libraries
+import array
+import collections
+import functools
+import itertools
+import operator
+
+# strong_typing
+from .._textualize import TextualizeMixin
+from .._struct import Struct, _unexpectedKeyword
+from ._typed_array import TypedArray
+from ._typed_list import TypedList
+
+class _StringTable(object):
+	"""
+	Distinct strings of a column of a StructArray, stored as their codes
+	"""
+	__slots__ = ["strings", "codes"]
+
+	def __init__(self):
+		self.strings = []
+		self.codes = dict()
+
+	def encode(self, value):
+		try:
+			return self.codes[value]
+		except KeyError:
+			self.strings.append(value)
+			return self.codes.setdefault(value, len(self.strings)-1)
+
+	def decode(self, code):
+		return self.strings[code]
+
+	def lookup(self, value):
+		# Code of a value, without adding it to the table: strings that are
+		# not in it match no code
+		return self.codes.get(value, -1)
+
+class _Column(object):
+	"""
+	How the values of a parameter are stored in a column of a StructArray
+
+	Values are normalized, then encoded to what is stored, and decoded when
+	read. ``encode`` and ``decode`` are None when values are stored as they are.
+	Strings are encoded by a table belonging to each StructArray (see
+	:meth:`codec`).
+	"""
+	def __init__(self, parameter):
+		# typed_parameters depends on this package
+		from ..typed_parameters import (IntegerParameter,
+		                                FloatParameter,
+		                                BoolParameter,
+		                                EnumParameter,
+		                                StringParameter)
+		self.id = parameter.id
+		self.parameter = parameter
+		self.normalizer = parameter.valueNormalizer
+		# None and "" are replaced by the default, as in Structs
+		self.default = parameter.descriptor_type(parameter).default
+		self.encode = None
+		self.decode = None
+		self.copy = None
+		self.typename = None
+		self.typecode = None
+		self.interned = False
+
+		# Optional numbers can be None, and are not stored in arrays
+		optional = parameter.default is None
+
+		if isinstance(parameter, BoolParameter) and not optional:
+			self.typecode = "B"
+			self.encode = int
+			self.decode = bool
+		elif isinstance(parameter, IntegerParameter) and not optional:
+			self.typename = int
+		elif isinstance(parameter, FloatParameter) and not optional:
+			self.typename = float
+		elif isinstance(parameter, EnumParameter):
+			members = tuple(parameter.choices)
+			self.typecode = "B" if len(members) <= 0x100 else "H"
+			self.encode = dict((member, code) for code, member in enumerate(members)).__getitem__
+			self.decode = members.__getitem__
+		elif isinstance(parameter, StringParameter):
+			# Each distinct string is only stored once, in a table
+			self.typecode = "L"
+			self.interned = True
+		else:
+			# Mutable values are copied when coming from or leaving the array
+			self.copy = parameter.copyValue
+		self.lookup = self.encode
+
+	def normalize(self, value):
+		if value is None or value == "":
+			return self.default()
+		return self.normalizer(value)
+
+	def codec(self):
+		# Returns the object encoding and decoding the values of a new
+		# StructArray: a new table for strings, the column itself otherwise
+		return _StringTable() if self.interned else self
+
+	def storage(self, values=[]):
+		# Returns a new storage of already encoded values
+		if self.typename is not None:
+			return TypedArray(self.typename, values)
+		elif self.typecode is not None:
+			return array.array(self.typecode, values)
+		return list(values)
+
+def _columns(cls):
+	# Columns of cls, created on first use. They are shared by all the
+	# StructArrays of cls, and keep no value
+	if not "__STRUCT_ARRAY_COLUMNS__" in cls.__dict__:
+		cls.__STRUCT_ARRAY_COLUMNS__ = tuple(_Column(parameter) for parameter in cls.__ATTRIBUTES__)
+	return cls.__STRUCT_ARRAY_COLUMNS__
+
+class _ColumnField(object):
+	"""
+	Descriptor reading and writing a value of the row of a view
+	"""
+	__slots__ = ["_position", "_column"]
+
+	def __init__(self, position, column):
+		self._position = position
+		self._column = column
+
+	def __get__(self, view, owner):
+		if view is None:
+			return self
+		value = view._array._storages[self._position][view._index]
+		decode = view._array._codecs[self._position].decode
+		if decode is not None:
+			return decode(value)
+		return value
+
+	def __set__(self, view, value):
+		value = self._column.normalize(value)
+		encode = view._array._codecs[self._position].encode
+		if encode is not None:
+			value = encode(value)
+		view._array._storages[self._position][view._index] = value
+
+class _RowView(collections.Mapping, TextualizeMixin):
+	"""
+	View of a row of a StructArray, whose attributes are read from and written
+	to its columns
+	"""
+	__slots__ = ["_array", "_index"]
+	_typename = None
+
+	def __init__(self, struct_array, index):
+		self._array = struct_array
+		self._index = index
+
+	def keys(self):
+		return [parameter.id for parameter in self._typename.__ATTRIBUTES__]
+
+	def __getitem__(self, key):
+		if not key in self.keys():
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __iter__(self):
+		return iter(self.keys())
+
+	def __len__(self):
+		return len(self._typename.__ATTRIBUTES__)
+
+	def __contains__(self, key):
+		return key in self.keys()
+
+	def toStruct(self):
+		"""
+		Returns a copy of the row as an instance of the Struct
+		"""
+		return self._array._struct(self._index)
+
+	def __eq__(self, other):
+		if isinstance(other, _RowView):
+			other = other.toStruct()
+		return self.toStruct() == other
+
+	def __ne__(self, other):
+		return not (self == other)
+
+	def __repr__(self):
+		return "<%s row %d>"%(self._typename.__name__, self._index)
+
+def _viewType(cls):
+	# View class of the rows of StructArrays of cls, created on first use
+	if not "__STRUCT_ARRAY_VIEW__" in cls.__dict__:
+		namespace = dict(__slots__=[], _typename=cls)
+		for position, column in enumerate(_columns(cls)):
+			namespace[column.id] = _ColumnField(position, column)
+		cls.__STRUCT_ARRAY_VIEW__ = type("%sRow"%cls.__name__, (_RowView,), namespace)
+	return cls.__STRUCT_ARRAY_VIEW__
+
+class StructArray(TextualizeMixin):
+	"""
+	Contains Structs of a single class, stored by column.
+
+	Each parameter's values are kept in a column: integers and floats in
+	:class:`TypedArray` objects, booleans and enums as codes in arrays, and
+	strings as codes referring to a table of the distinct strings of the
+	array (shared with the arrays made from its rows). Other values, and
+	optional numbers, are kept in a list. Compared to a :class:`TypedList` of Structs, no
+	object is created per row, and operations on a column only go through
+	that column.
+
+	Items are views of the rows, behaving like the Struct: their attributes
+	read and write the columns. A view keeps its index, and is not updated
+	when rows are added before it.
+
+	::
+
+	  poses = StructArray(Pose, [dict(x=1., y=2.), Pose(x=3., y=0.)])
+	  poses[1].y = 1.
+	  mean_x = sum(poses.column("x"))/len(poses)
+	  moving = poses.filter(status="moving")
+	"""
+
+	# ───────────
+	# Constructor
+
+	def __init__(self, typename, args=[]):
+		"""
+		Create a StructArray
+
+		:param typename: Struct class of the rows
+		:param args: Initial rows, as Structs or dicts of their values (can
+		             be empty)
+		:raises: TypeError if a row is neither a ``typename`` nor a dict, or
+		         if a dict has an unknown key
+		"""
+		if not isinstance(typename, type) or not issubclass(typename, Struct):
+			raise TypeError("StructArray: rows can only be Structs. %s received"%typename)
+		if len(typename.__ATTRIBUTES__) == 0:
+			raise TypeError("StructArray: %s has no parameter to store"%typename.__name__)
+		self._typename = typename
+		self._columns = _columns(typename)
+		self._ids = [column.id for column in self._columns]
+		self._id_set = frozenset(self._ids)
+		self._view_type = _viewType(typename)
+		self._codecs = [column.codec() for column in self._columns]
+		self._storages = [column.storage() for column in self._columns]
+		self.extend(args)
+
+	def _new(self, storages):
+		# Returns a StructArray of the same type, using the given storages
+		result = self.__class__.__new__(self.__class__)
+		result._typename = self._typename
+		result._columns = self._columns
+		result._ids = self._ids
+		result._id_set = self._id_set
+		result._view_type = self._view_type
+		result._codecs = self._codecs
+		result._storages = storages
+		return result
+
+	# ───────
+	# Methods
+
+	def _checkRows(self, rows):
+		# Returns rows as a list, after checking their type and keys
+		rows = rows if isinstance(rows, list) else list(rows)
+		ids = self._id_set
+		for row in rows:
+			if isinstance(row, dict):
+				if not ids.issuperset(row):
+					raise TypeError(_unexpectedKeyword(next(key for key in row if not key in ids)))
+			elif not isinstance(row, self._typename):
+				raise TypeError("StructArray: rows are expected to be %s or dict. %s received"%(self._typename, type(row)))
+		return rows
+
+	def _encode(self, position, rows):
+		# Returns the stored values of a column in the given (checked) rows
+		column = self._columns[position]
+		id = column.id
+		get = operator.attrgetter(id)
+		normalizer = column.normalizer
+		default = column.default
+		copy = column.copy
+		values = []
+		append = values.append
+		for row in rows:
+			if isinstance(row, dict):
+				value = row.get(id)
+				append(default() if value is None or value == "" else normalizer(value))
+			elif copy is None:
+				append(get(row))
+			else:
+				append(copy(get(row)))
+		encode = self._codecs[position].encode
+		if encode is not None:
+			values = list(map(encode, values))
+		return values
+
+	def _struct(self, index):
+		# Returns a standalone instance of the index-th row
+		values = []
+		for column, codec, storage in zip(self._columns, self._codecs, self._storages):
+			value = storage[index]
+			if codec.decode is not None:
+				value = codec.decode(value)
+			elif column.copy is not None:
+				value = column.copy(value)
+			values.append(value)
+		return self._typename._fromTrusted(values)
+
+	def append(self, row):
+		self.extend([row])
+
+	def extend(self, rows):
+		# Values are all encoded before any column is modified, so that the
+		# array is unchanged if a value is rejected
+		rows = self._checkRows(rows)
+		columns_values = [self._encode(position, rows) for position in range(len(self._columns))]
+		for storage, values in zip(self._storages, columns_values):
+			storage.extend(values)
+
+	def column(self, id):
+		"""
+		Returns the values of a parameter
+
+		:param id: Id of the parameter
+		:raises: KeyError if there is no such parameter
+
+		Integers and floats are returned as the :class:`TypedArray` storing
+		them, without copy: modifying it modifies the rows. Other values are
+		returned in a new list.
+		"""
+		column = self._columns[self._ids.index(id)] if id in self._ids else None
+		if column is None:
+			raise KeyError(id)
+		position = self._ids.index(id)
+		storage = self._storages[position]
+		if column.typename is not None:
+			return storage
+		elif self._codecs[position].decode is not None:
+			return list(map(self._codecs[position].decode, storage))
+		return list(storage)
+
+	def compress(self, selectors):
+		"""
+		Returns the rows whose selector is true
+
+		:param selectors: Sequence of booleans, one per row
+		"""
+		selectors = list(selectors)
+		return self._new([column.storage(itertools.compress(storage, selectors))
+		                  for column, storage in zip(self._columns, self._storages)])
+
+	def filter(self, **values):
+		"""
+		Returns the rows with the given values
+
+		:param values: Values to match, by parameter id
+
+		Values are compared in their stored form, without decoding the
+		columns. Strings not stored in the array are not added to its table.
+		"""
+		selectors = None
+		for id, value in values.items():
+			if not id in self._ids:
+				raise TypeError(_unexpectedKeyword(id))
+			position = self._ids.index(id)
+			column = self._columns[position]
+			value = column.normalize(value)
+			if self._codecs[position].lookup is not None:
+				value = self._codecs[position].lookup(value)
+			matches = list(map(functools.partial(operator.eq, value), self._storages[position]))
+			selectors = matches if selectors is None else list(map(operator.and_, selectors, matches))
+		return self.compress([True]*len(self) if selectors is None else selectors)
+
+	def toList(self):
+		"""
+		Returns the rows as a :class:`TypedList` of Structs
+		"""
+		return TypedList(self._typename, [self._struct(index) for index in range(len(self))])
+
+	def __len__(self):
+		return len(self._storages[0])
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self._new([column.storage(storage[index])
+			                  for column, storage in zip(self._columns, self._storages)])
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("StructArray index out of range")
+		return self._view_type(self, index)
+
+	def __setitem__(self, index, row):
+		rows = self._checkRows([row])
+		values = [self._encode(position, rows)[0] for position in range(len(self._columns))]
+		for storage, value in zip(self._storages, values):
+			storage[index] = value
+
+	def __iter__(self):
+		view_type = self._view_type
+		for index in range(len(self)):
+			yield view_type(self, index)
+
+	# ──────────
+	# Properties
+
+	@property
+	def typename(self):
+		return self._typename
+
+	# ─────────
+	# Operators
+
+	def __eq__(self, other):
+		if isinstance(other, StructArray):
+			return self._typename is other._typename and self.toList() == other.toList()
+		elif isinstance(other, list):
+			return self.toList() == other
+		return False
+
+	def __ne__(self, other):
+		return not (self == other)
+
+	__hash__ = None
+
+collections.Sequence.register(StructArray)
+
+__all__ = ["StructArray"]
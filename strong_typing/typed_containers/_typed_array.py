@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard libraries
+import array
+import collections
+
+# strong_typing
+from .._textualize import TextualizeMixin
+
+try:
+	array.array("q")
+	_INTEGER_TYPECODE = "q"
+except ValueError:
+	# Python 2 has no "long long" arrays
+	_INTEGER_TYPECODE = "l"
+
+class TypedArray(array.array, TextualizeMixin):
+	"""
+	Contains numbers of a single type, packed in a buffer.
+
+	Compared to a :class:`TypedList`, numbers are not stored as Python
+	objects, which saves most of the memory, and values of the right type are
+	added without checking them one by one.
+
+	The buffer protocol is supported (``memoryview``, ``numpy.frombuffer``,
+	...) and ``numpy.array(typed_array)`` creates a NumPy array of the matching
+	dtype.
+
+	It has the methods and operators of a list, but is not one: ``json`` and
+	other code checking for lists must be given ``list(typed_array)``, and
+	integers must fit in 64 bits.
+	"""
+	__slots__ = []
+
+	# Supported element types, and their typecode in the array
+	TYPECODES = {int: _INTEGER_TYPECODE, float: "d"}
+
+	# ───────────
+	# Constructor
+
+	def __new__(cls, typename, args=[]):
+		try:
+			typecode = TypedArray.TYPECODES[typename]
+		except (KeyError, TypeError):
+			msg = "TypedArray: elements can only be int or float. %s received"
+			raise TypeError(msg%typename)
+		return array.array.__new__(cls, typecode)
+
+	def __init__(self, typename, args=[]):
+		"""
+		Create a TypedArray
+
+		:param typename: Type of the elements (int or float)
+		:param args: Initial elements (can be empty)
+		:raises: TypeError if an element cannot be converted
+		"""
+		array.array.extend(self, self._coerce(args))
+
+	# ───────
+	# Methods
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self._fromArray(array.array.__getitem__(self, index))
+		return array.array.__getitem__(self, index)
+
+	def __getslice__(self, start, stop):
+		return self.__getitem__(slice(start, stop))
+
+	def __setitem__(self, index, value):
+		try:
+			if isinstance(index, slice):
+				array.array.__setitem__(self, index, self._coerce(value))
+			else:
+				array.array.__setitem__(self, index, self._checkType(value))
+		except OverflowError:
+			raise self._overflow()
+
+	def __setslice__(self, start, stop, value):
+		self.__setitem__(slice(start, stop), value)
+
+	def _fromArray(self, values):
+		# Returns a TypedArray of the same type holding the given array
+		result = array.array.__new__(self.__class__, self.typecode)
+		array.array.extend(result, values)
+		return result
+
+	def _overflow(self):
+		# Error raised for numbers too large for the array, like for elements
+		# of the wrong type
+		msg = "TypedArray: array elements are expected to be %s. Out of range value received"
+		return TypeError(msg%self.typename)
+
+	def _checkType(self, element):
+		try:
+			if isinstance(element, self.typename):
+				return element
+			return self.typename(element)
+		except Exception as e:
+			msg = "TypedArray: array elements are expected to be %s. %s received"
+			msg = msg%(self.typename, type(element))
+			raise TypeError(msg)
+
+	def _coerce(self, values):
+		# Returns values as an array of the same typecode. The conversion done
+		# by array.array handles most inputs at once, elements are only
+		# converted one by one when it fails.
+		if not isinstance(values, (list, tuple, array.array)):
+			values = list(values)
+		try:
+			return array.array(self.typecode, values)
+		except TypeError:
+			pass
+		except OverflowError:
+			raise self._overflow()
+		try:
+			return array.array(self.typecode, [self._checkType(value) for value in values])
+		except OverflowError:
+			raise self._overflow()
+
+	def extend(self, iterable):
+		array.array.extend(self, self._coerce(iterable))
+
+	def append(self, element):
+		try:
+			array.array.append(self, self._checkType(element))
+		except OverflowError:
+			raise self._overflow()
+
+	def insert(self, index, element):
+		try:
+			array.array.insert(self, index, self._checkType(element))
+		except OverflowError:
+			raise self._overflow()
+
+	def sort(self, key=None, reverse=False):
+		array.array.__setitem__(self, slice(None), array.array(self.typecode, sorted(self, key=key, reverse=reverse)))
+
+	def appendDefault(self):
+		array.array.append(self, self.typename())
+
+	def clear(self):
+		array.array.__delitem__(self, slice(None))
+
+	def copy(self):
+		return self.__copy__()
+
+	def __add__(self, other):
+		result = self._fromArray(self)
+		result.extend(other)
+		return result
+
+	def __iadd__(self, other):
+		self.extend(other)
+		return self
+
+	def __mul__(self, count):
+		return self._fromArray(array.array.__mul__(self, count))
+
+	__rmul__ = __mul__
+
+	def __copy__(self):
+		return self.__class__(self.typename, self)
+
+	def __deepcopy__(self, memo):
+		# Numbers are immutable
+		return self.__copy__()
+
+	def __reduce_ex__(self, protocol):
+		return (self.__class__, (self.typename, array.array(self.typecode, self)))
+
+	def __array__(self, dtype=None):
+		import numpy
+		result = numpy.frombuffer(self, dtype=self.typecode).copy() if len(self) else numpy.empty(0, dtype=self.typecode)
+		return result if dtype is None else result.astype(dtype)
+
+	# ──────────
+	# Properties
+
+	@property
+	def typename(self):
+		return int if self.typecode == _INTEGER_TYPECODE else float
+
+	# ─────────
+	# Operators
+
+	def __eq__(self, other):
+		if isinstance(other, array.array):
+			if isinstance(other, TypedArray) and self.typename != other.typename:
+				return False
+			return array.array.__eq__(self, other)
+		elif not isinstance(other, list):
+			return False
+		elif getattr(other, "typename", self.typename) != self.typename:
+			return False
+		return self.tolist() == list(other)
+
+	def __ne__(self, other):
+		return not (self == other)
+
+	__hash__ = None
+
+collections.MutableSequence.register(TypedArray)
+
+__all__ = ["TypedArray"]
@@ -28,43 +28,94 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+# Standard libraries
+import copy
+
 # strong_typing
 from .._textualize import TextualizeMixin
 from .._struct import Struct
+from ._typed_array import TypedArray
 
 # class TypedList(type):
 
 #     def __new__(mcs, typename):
 
+def _coercer(typename):
+    """
+    Returns the function converting an element to ``typename``
+
+    Elements already of that type are kept, dicts are used as keyword
+    arguments for Structs, and anything else is given to ``typename``.
+    """
+    try:
+        is_struct = issubclass(typename, Struct)
+    except TypeError:
+        is_struct = False
+
+    if is_struct:
+        def coerce(element):
+            if isinstance(element, typename):
+                return element
+            elif isinstance(element, dict):
+                return typename(**element)
+            else:
+                return typename(element)
+    else:
+        def coerce(element):
+            if isinstance(element, typename):
+                return element
+            else:
+                return typename(element)
+    return coerce
+
 class TypedList(list, TextualizeMixin):
     """
     Contains a list of statically-typed objects.
     """
+    __slots__ = ["__typename", "__coerce"]
 
     # ───────────
     # Constructor
 
-    def __init__(self, typename, args=[]):
+    def __new__(cls, typename=None, args=[], lazy=False):
+        if lazy and cls is TypedList:
+            cls = _LazyTypedList
+        return list.__new__(cls)
+
+    def __init__(self, typename, args=[], lazy=False):
         """
         Create a TypedList
 
         :param typename: Type to be accepted in the list (type or class)
         :param args: List of initialization arguments (can be empty)
+        :param lazy: For lists of Structs, keep the dicts given as elements
+                     and only convert them when they are accessed
         :raises: TypeError if argument type is invalid
         """
         self.__typename = typename
-        for element in args:
-            self.append(element=element)
+        self.__coerce = _coercer(typename)
+        list.extend(self, self._checkTypes(args))
+
+    @classmethod
+    def _fromTrusted(cls, typename, elements):
+        """
+        Creates a TypedList of elements that are all known to be ``typename``
+
+        No check is made: this is meant for elements this package has just
+        built (for instance when decoding JSON).
+        """
+        result = list.__new__(cls)
+        result.__typename = typename
+        result.__coerce = _coercer(typename)
+        list.extend(result, elements)
+        return result
 
     # ───────
     # Methods
 
     def __setitem__(self, index, value):
         if isinstance(value, (list, set, tuple)) and isinstance(index, slice):
-            list_to_extend = []
-            for element in value:
-                list_to_extend.append(self._checkType(element))
-            list.__setitem__(self, index, list_to_extend)
+            list.__setitem__(self, index, self._checkTypes(value))
         else:
             list.__setitem__(self, index, self._checkType(value))
 
@@ -73,23 +124,30 @@ class TypedList(list, TextualizeMixin):
 
     def _checkType(self, element):
         try:
-            if isinstance(element, self.__typename):
-                return element
-            elif issubclass(self.__typename, Struct) and isinstance(element, dict):
-                return self.__typename(**element)
-            else:
-                return self.__typename(element)
+            return self.__coerce(element)
         except Exception as e:
             msg = "TypedList: list elements are expected to be %s. %s received"
             msg = msg%(self.__typename, type(element))
             raise TypeError(msg)
 
-    def extend(self, iterable):
-        list_to_extend = []
-        for element in iterable:
-            list_to_extend.append(self._checkType(element))
+    def _checkTypes(self, elements):
+        # Returns the given elements, all of the list's type
+        if isinstance(elements, TypedList) and elements.__typename is self.__typename:
+            # Elements were checked when added to the other list
+            return elements
+        if not isinstance(elements, (list, tuple)):
+            elements = list(elements)
 
-        list.extend(self, list_to_extend)
+        # Elements are usually all of the same type, checked only once
+        try:
+            if all([issubclass(element_type, self.__typename) for element_type in set(map(type, elements))]):
+                return elements
+        except TypeError:
+            pass
+        return [self._checkType(element) for element in elements]
+
+    def extend(self, iterable):
+        list.extend(self, self._checkTypes(iterable))
 
     def append(self, element):
         list.append(self, self._checkType(element))
@@ -100,6 +158,34 @@ class TypedList(list, TextualizeMixin):
     def appendDefault(self):
         list.append(self, self.__typename())
 
+    def materialize(self):
+        """
+        Converts the elements that were kept as given (see ``lazy``)
+
+        :returns: The list itself
+        :raises: TypeError if an element cannot be converted
+        """
+        return self
+
+    def __copy__(self):
+        # Elements already passed the type check when they were added
+        result = self.__class__.__new__(self.__class__)
+        result.__typename = self.__typename
+        result.__coerce = self.__coerce
+        list.extend(result, self)
+        return result
+
+    def __deepcopy__(self, memo):
+        result = self.__class__.__new__(self.__class__)
+        result.__typename = self.__typename
+        result.__coerce = self.__coerce
+        memo[id(self)] = result
+        list.extend(result, [copy.deepcopy(element, memo) for element in self])
+        return result
+
+    def __reduce_ex__(self, protocol):
+        return (self.__class__, (self.__typename, list(self)))
+
     # ──────────
     # Properties
 
@@ -107,11 +193,17 @@ class TypedList(list, TextualizeMixin):
     def typename(self):
         return self.__typename
 
+    @property
+    def lazy(self):
+        return False
+
     # ─────────
     # Operators
 
     def __eq__(self, other):
-        if not isinstance(other, list):
+        if isinstance(other, TypedArray):
+            return other == self
+        elif not isinstance(other, list):
             return False
         elif isinstance(other, TypedList) and self.typename != other.typename:
             return False
@@ -129,4 +221,125 @@ class TypedList(list, TextualizeMixin):
         # return DefinedTypedList
         # return type('TypedList_'+typename.__name__, (DefinedTypedList,), dict())
 
+def _materializing(method):
+    # Wraps a list method reading the stored elements, that must all be
+    # converted first
+    def wrapper(self, *args, **kwargs):
+        self.materialize()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+class _LazyTypedList(TypedList):
+    """
+    TypedList of Structs keeping the dicts it receives, until they are read.
+
+    Conversions are only done (and their errors raised) on access, or when
+    calling :meth:`materialize`. Dicts are kept as they are given, so they must
+    not be modified in the meantime.
+
+    List methods and operators convert the elements they read. Code reading
+    the list's storage directly from C (like the ``json`` module) still sees
+    the dicts to convert, and must be given a materialized list.
+    """
+    __slots__ = ["__defer"]
+
+    def __init__(self, typename, args=[], lazy=True):
+        try:
+            self.__defer = issubclass(typename, Struct)
+        except TypeError:
+            self.__defer = False
+        TypedList.__init__(self, typename, args)
+
+    def _checkType(self, element):
+        if self.__defer and type(element) is dict:
+            return element
+        return TypedList._checkType(self, element)
+
+    def _checkTypes(self, elements):
+        if isinstance(elements, _LazyTypedList) and elements.typename is self.typename:
+            # Take the elements as they are stored, without converting them
+            return list(list.__iter__(elements))
+        if self.__defer and not isinstance(elements, TypedList):
+            if not isinstance(elements, (list, tuple)):
+                elements = list(elements)
+            if set(map(type, elements)) == set([dict]):
+                return elements
+        return TypedList._checkTypes(self, elements)
+
+    def _materializeAt(self, index):
+        element = list.__getitem__(self, index)
+        if type(element) is dict:
+            element = TypedList._checkType(self, element)
+            list.__setitem__(self, index, element)
+        return element
+
+    def materialize(self):
+        for index in range(len(self)):
+            self._materializeAt(index)
+        return self
+
+    # ───────────────
+    # Element reading
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materializeAt(i) for i in range(*index.indices(len(self)))]
+        return self._materializeAt(index)
+
+    def __getslice__(self, start, stop):
+        return self.__getitem__(slice(start, stop))
+
+    def __iter__(self):
+        index = 0
+        while index < len(self):
+            yield self._materializeAt(index)
+            index += 1
+
+    def __reversed__(self):
+        index = len(self)-1
+        while index >= 0:
+            yield self._materializeAt(index)
+            index -= 1
+
+    def pop(self, index=-1):
+        element = list.pop(self, index)
+        if type(element) is dict:
+            element = TypedList._checkType(self, element)
+        return element
+
+    __contains__ = _materializing(list.__contains__)
+    __add__ = _materializing(list.__add__)
+    __mul__ = _materializing(list.__mul__)
+    __rmul__ = _materializing(list.__rmul__)
+    __repr__ = _materializing(list.__repr__)
+    __lt__ = _materializing(list.__lt__)
+    __le__ = _materializing(list.__le__)
+    __gt__ = _materializing(list.__gt__)
+    __ge__ = _materializing(list.__ge__)
+    index = _materializing(list.index)
+    count = _materializing(list.count)
+    remove = _materializing(list.remove)
+    sort = _materializing(list.sort)
+    if hasattr(list, "copy"):
+        copy = _materializing(list.copy)
+
+    def __copy__(self):
+        # Elements still to convert are shared, and converted separately
+        return TypedList(self.typename, list(list.__iter__(self)), lazy=True)
+
+    def __deepcopy__(self, memo):
+        result = TypedList(self.typename, lazy=True)
+        memo[id(self)] = result
+        list.extend(result, [copy.deepcopy(element, memo) for element in list.__iter__(self)])
+        return result
+
+    # ──────────
+    # Properties
+
+    @property
+    def lazy(self):
+        return True
+
 __all__ = ["TypedList"]
\ No newline at end of file
@@ -29,13 +29,20 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 # Standard libraries
+import copy
+import functools
 import re
+import sys
 
 # Third-party libraries
 import enum
 
 # strong_typing
-from ..typed_containers import TypedList
+from .._descriptors import ParameterDescriptor, ImmutableParameterDescriptor
+from ..typed_containers import TypedArray, TypedList
+
+if sys.version_info >= (3,0):
+	unicode = str
 
 # ───────────────────────────────── Helpers ────────────────────────────────── #
 
@@ -45,6 +52,26 @@ def isSnakecase(s):
 def snakecase(s):
 	return re.sub(r"[^a-z0-9]", "_", s.lower())
 
+class Ownership(enum.Enum):
+	"""
+	What a container parameter (:class:`VectorParameter` or
+	:class:`StructParameter`) does with an assigned value already of its type
+
+	``COPY``
+		The value is rebuilt and all its content normalized again (default
+		behavior)
+	``CLONE``
+		The value is copied without normalizing its content again, so later
+		changes to the assigned value are not seen by the Struct
+	``TAKE``
+		The value is stored as it is, and thus shared with the caller
+
+	Other values (dicts, lists, ...) are always converted.
+	"""
+	COPY = "copy"
+	CLONE = "clone"
+	TAKE = "take"
+
 # ──────────────────────────── Type classes ────────────────────────────────── #
 
 class ParameterType(object):
@@ -70,6 +97,10 @@ class ParameterType(object):
 		and its value will be accessible by calling
 		<owning_class>.my_parameter
 	"""
+
+	# Descriptor giving access to the parameter in a Struct
+	descriptor_type = ParameterDescriptor
+
 	def __init__(self, name, description, default, id = None):
 		self.name = name
 		self.description = description
@@ -94,6 +125,28 @@ class ParameterType(object):
 		else:
 			raise NotImplementedError
 
+	@property
+	def valueNormalizer(self):
+		"""
+		Same as :py:attr:`normalizer`, for values other than ``None``.
+
+		Structs never normalize ``None``, so parameters can provide here a
+		cheaper function that does not check it.
+		"""
+		if hasattr(self, "_value_normalizer"):
+			return self._value_normalizer
+		else:
+			return self.normalizer
+
+	def copyValue(self, value):
+		"""
+		Copies a value of this parameter, to be stored in another Struct.
+
+		``value`` is already valid, so parameters override this to skip the
+		normalization when they can.
+		"""
+		return self.normalizer(value)
+
 class NumericParameter(ParameterType):
 	"""
 	Base type for numeric parameters
@@ -111,25 +164,53 @@ class NumericParameter(ParameterType):
 	case the inserted value does not match the requirement, the function
 	must provide a valid value instead of the inserted one.
 	"""
+	descriptor_type = ImmutableParameterDescriptor
+
 	def __init__(self, name, description, default, normalizer,
 	                   range=(None,None), id = None):
 		ParameterType.__init__(self, name, description, default, id)
 		self.default = default
 		f = lambda x: None if x is None else normalizer(x)
 		self.range   = tuple(map(f, range))
+		self._value_normalizer = NumericParameter._specialize(normalizer, *self.range)
 
+		value_normalizer = self._value_normalizer
 		def _normalizer(x):
 			if x is None:
 				return None
-			x = normalizer(x)
-			if not self.range[0] is None and x < self.range[0]:
-				x = self.range[0]
-			if not self.range[1] is None and x > self.range[1]:
-				x = self.range[1]
-			return x
+			return value_normalizer(x)
 
 		self._normalizer = _normalizer
 
+	@staticmethod
+	def _specialize(normalizer, minimum, maximum):
+		# Builds the cheapest function normalizing a value and keeping it in
+		# the range, given the bounds that are actually defined
+		if minimum is None and maximum is None:
+			return normalizer
+
+		if maximum is None:
+			def clamp(x):
+				x = normalizer(x)
+				return minimum if x < minimum else x
+		elif minimum is None:
+			def clamp(x):
+				x = normalizer(x)
+				return maximum if x > maximum else x
+		else:
+			def clamp(x):
+				x = normalizer(x)
+				if x < minimum:
+					x = minimum
+				if x > maximum:
+					x = maximum
+				return x
+		return clamp
+
+	def copyValue(self, value):
+		# Values are immutable and can be shared
+		return value
+
 class IntegerParameter(NumericParameter):
 	"""
 	Integer parameter
@@ -158,23 +239,71 @@ class FloatParameter(NumericParameter):
 		NumericParameter.__init__(self, name, description, default,
 		                                _normalizer, range, id)
 
+# Textual representations of booleans, in the usual cases
+_BOOL_SPELLINGS = dict((variant, value)
+                       for spelling, value in [("true", True), ("false", False),
+                                               ("yes", True), ("no", False),
+                                               ("on", True), ("off", False),
+                                               ("1", True), ("0", False)]
+                       for variant in [spelling, spelling.capitalize(), spelling.upper()])
+
+def _legacyBool(x):
+	# Conversion of any other value
+	try:
+		if int(x)==0:
+			return False
+	except ValueError:
+		pass
+
+	return False if x in ["False", "false"] else bool(x)
+
 class BoolParameter(ParameterType):
-	def __init__(self, name="", description="", default=False, id = None):
+	"""
+	Boolean parameter
+
+	:param strict: Reject the values that are not a boolean, 0, 1 or one of
+	               their textual representations (true/false, yes/no, on/off,
+	               in any case)
+
+	When not strict, other values are converted the way ``bool`` does, except
+	for the numbers truncated to 0 (e.g. 0.5), which are ``False``.
+	"""
+	descriptor_type = ImmutableParameterDescriptor
+
+	def __init__(self, name="", description="", default=False, id = None,
+	                   strict=False):
 		ParameterType.__init__(self, name, description, default, id)
+		self.strict = strict
+
+		def value_normalizer(x):
+			value_type = type(x)
+			if value_type is bool:
+				return x
+			elif value_type is int and (not strict or x in (0, 1)):
+				return x != 0
+			elif value_type is str or value_type is unicode:
+				value = _BOOL_SPELLINGS.get(x)
+				if value is None:
+					value = _BOOL_SPELLINGS.get(x.strip().lower())
+				if value is not None:
+					return value
+
+			if strict:
+				raise ValueError("%r is not a valid boolean"%(x,))
+			return _legacyBool(x)
 
 		def normalizer(x):
 			if x is None:
 				return None
-			try:
-				if int(x)==0:
-					return False
-			except ValueError:
-				pass
-
-			return False if x in ["False", "false"] else bool(x)
+			return value_normalizer(x)
 
+		self._value_normalizer = value_normalizer
 		self._normalizer = normalizer
 
+	def copyValue(self, value):
+		# Values are immutable and can be shared
+		return value
+
 class EnumParameter(ParameterType):
 	"""
 	Parameter describing a set of choices
@@ -186,18 +315,27 @@ class EnumParameter(ParameterType):
 	If ``default`` is ``None``, the first of the available choices is selected as
 	default.
 	"""
+	descriptor_type = ImmutableParameterDescriptor
+
 	class EnumFromList(enum.Enum):
 		def __eq__(self, other):
-			if isinstance(other, str):
-				return self.name == other
+			# _name_ is read directly, name being a slower dynamic attribute
+			if self is other:
+				return True
+			elif isinstance(other, str):
+				return self._name_ == other
 			elif isinstance(other, type(self)):
-				return self.name == other.name
+				return self._name_ == other._name_
 			else:
 				return False
 
 		def __ne__(self, other):
 			return not self.__eq__(other)
 
+		def __hash__(self):
+			# Members are equal to their name
+			return hash(self._name_)
+
 		def __str__(self):
 			return str(self.name)
 
@@ -206,13 +344,9 @@ class EnumParameter(ParameterType):
 
 	def __init__(self, choices, name="", description="", default=None, id = None):
 		if isinstance(choices, list):
-			_choices = enum._EnumDict()
-			for i in range(len(choices)):
-				_choices[choices[i]] = i
-			choices=enum.EnumMeta("_local_enum_from_list_",
-				                  (EnumParameter.EnumFromList,),
-				                  _choices,
-				                 )
+			if len(choices)==0:
+				raise TypeError("Enum's choices cannot be an empty")
+			choices = EnumParameter._enumFromList(choices)
 		elif not isinstance(choices, type) or not issubclass(choices, enum.Enum):
 			# If choices is not a class and not an enum
 			raise TypeError("Enum's choices can only be a list or an enum.Enum")
@@ -229,16 +363,63 @@ class EnumParameter(ParameterType):
 			default = list(self.choices)[0]
 
 		ParameterType.__init__(self, name, description, default, id)
+		self._index = EnumParameter._buildIndex(self.choices)
 
+		index = self._index
 		def normalizer(x):
-			if isinstance(x, enum.Enum):
-				return self.choices(x)
-			else:
-				return self.choices[x]
+			try:
+				return index[x]
+			except (KeyError, TypeError):
+				# Let the enum handle (or reject) anything else
+				if isinstance(x, enum.Enum):
+					return self.choices(x)
+				else:
+					return self.choices[x]
 
 		self._normalizer = normalizer
 
+	# Enums built from a list, by tuple of choices
+	_list_enums = dict()
+
+	@staticmethod
+	def _enumFromList(choices):
+		# Parameters with the same choices share the same enum, which is only
+		# created once
+		key = tuple(choices)
+		try:
+			return EnumParameter._list_enums[key]
+		except KeyError:
+			pass
+		members = [(choices[i], i) for i in range(len(choices))]
+		return EnumParameter._list_enums.setdefault(key,
+		    EnumParameter.EnumFromList("_local_enum_from_list_", members, module=__name__))
+
+	@staticmethod
+	def _buildIndex(choices):
+		# Maps the accepted inputs to their canonical member: members and
+		# names, and the values of user-defined enums (those of enums built
+		# from a list are only an implementation detail)
+		index = dict()
+		if not issubclass(choices, EnumParameter.EnumFromList):
+			for member in choices:
+				try:
+					index.setdefault(member.value, member)
+				except TypeError:
+					# Unhashable value
+					pass
+		for member_name, member in choices.__members__.items():
+			index[member_name] = member
+		for member in choices:
+			index[member] = member
+		return index
+
+	def copyValue(self, value):
+		# Values are immutable and can be shared
+		return value
+
 class StringParameter(ParameterType):
+	descriptor_type = ImmutableParameterDescriptor
+
 	def __init__(self, name="", description="", default=None, id = None):
 		default = str(default) if default is not None else ""
 		ParameterType.__init__(self, name, description, default, id)
@@ -248,21 +429,61 @@ class StringParameter(ParameterType):
 
 		self._normalizer = normalizer
 
+	def copyValue(self, value):
+		# Values are immutable and can be shared
+		return value
+
 class VectorParameter(ParameterType):
 	"""
 	Handles list
 
 	:param type: Type of the elements stored in the list
+	:param ownership: :class:`Ownership` of the assigned list
+	:param packed: Store the elements in a ``TypedArray`` instead of a
+	               ``TypedList``. Only int and float elements can be packed
+	:param lazy: For lists of Structs, only convert the dicts assigned as
+	             elements when they are accessed (see ``TypedList``)
 	"""
-	def __init__(self, type, name="", description="", default=None, id = None):
+	def __init__(self, type, name="", description="", default=None, id = None,
+	                   ownership=Ownership.COPY, packed=False, lazy=False):
 		default = list(default) if default is not None else list()
 		ParameterType.__init__(self, name, description, default, id)
-
-		def normalizer(x):
-			return TypedList(type, x)
+		self.type = type
+		self.ownership = Ownership(ownership)
+		if packed and not type in TypedArray.TYPECODES:
+			raise TypeError("Only int and float elements can be packed")
+		if packed and lazy:
+			raise TypeError("Packed lists cannot be lazy")
+		self.packed = packed
+		self.lazy = lazy
+
+		container = TypedArray if packed else TypedList
+		if lazy:
+			build = functools.partial(TypedList, type, lazy=True)
+		else:
+			build = functools.partial(container, type)
+
+		if self.ownership is Ownership.TAKE:
+			def normalizer(x):
+				if isinstance(x, container) and x.typename is type:
+					return x
+				return build(x)
+		elif self.ownership is Ownership.CLONE:
+			def normalizer(x):
+				if isinstance(x, container) and x.typename is type:
+					return copy.copy(x)
+				return build(x)
+		else:
+			normalizer = build
 
 		self._normalizer = normalizer
 
+	def copyValue(self, value):
+		if isinstance(value, (TypedList, TypedArray)) and value.typename is self.type:
+			# Elements were checked when added to value
+			return copy.copy(value)
+		return self.normalizer(value)
+
 # class Map(ParameterType):
 # 	def __init__(self, key_type, value_type, name="", description="", default=None, id = None):
 # 		default = default if default is not None else dict()
@@ -278,16 +499,37 @@ class StructParameter(ParameterType):
 	Handles a Struct
 
 	:param type: Type of the Struct to be used
+	:param ownership: :class:`Ownership` of the assigned Struct
 	"""
-	def __init__(self, type, default=None, name="", description="", id = None):
+	def __init__(self, type, default=None, name="", description="", id = None,
+	                   ownership=Ownership.COPY):
 		default = type(default) if isinstance(default, type) else type()
 		ParameterType.__init__(self, name, description, default, id)
-
-		def normalizer(x):
-			return type(**x)
+		self.type = type
+		self.ownership = Ownership(ownership)
+
+		if self.ownership is Ownership.TAKE:
+			def normalizer(x):
+				if x.__class__ is type:
+					return x
+				return type(**x)
+		elif self.ownership is Ownership.CLONE:
+			def normalizer(x):
+				if x.__class__ is type:
+					return type(x)
+				return type(**x)
+		else:
+			def normalizer(x):
+				return type(**x)
 
 		self._normalizer = normalizer
 
+	def copyValue(self, value):
+		if type(value) is self.type:
+			# Use the copy constructor, which copies slots directly
+			return self.type(value)
+		return self.normalizer(value)
+
 __all__ = ["IntegerParameter",
            "FloatParameter",
            # LongParameter,
@@ -298,4 +540,5 @@ __all__ = ["IntegerParameter",
            "EnumParameter",
            "VectorParameter",
            # MapParameter,
-           "StructParameter"]
\ No newline at end of file
+           "StructParameter",
+           "Ownership"]
\ No newline at end of file
@@ -3,7 +3,13 @@
 import unittest
 
 # Tests
+from test_binary import *
 from test_display import *
+from test_json import *
+from test_performance import *
+from test_record_file import *
+from test_static_typing_structarray import *
+from test_static_typing_typedarray import *
 from test_static_typing_typedlist import *
 from test_static_typing_typedstruct import *
 from test_type_checking_objects import *
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard libraries
+import enum
+import struct
+
+# Third-party libraries
+import pytest
+
+# Local modules
+from strong_typing import Struct, BinaryCodec
+from strong_typing.typed_parameters import *
+
+class Mode(enum.Enum):
+	IDLE = "idle"
+	RUNNING = "running"
+
+class Sample(Struct):
+	__ATTRIBUTES__ = [IntegerParameter(name="counter"),
+	                  FloatParameter(name="value"),
+	                  BoolParameter(name="valid"),
+	                  EnumParameter(Mode, name="mode"),
+	                  EnumParameter(["low", "high"], name="level")]
+
+def test_format():
+	codec = BinaryCodec(Sample)
+	assert(codec.type is Sample)
+	assert(codec.format in ("<qd?BB", b"<qd?BB"))
+	assert(codec.size == 8+8+1+1+1)
+
+	codec = BinaryCodec(Sample, formats=dict(counter="H", value="f"), byteorder=">")
+	assert(codec.format in (">Hf?BB", b">Hf?BB"))
+	assert(codec.size == 2+4+1+1+1)
+
+def test_bad_formats():
+	with pytest.raises(TypeError):
+		BinaryCodec(Sample, formats=dict(unknown="i"))
+
+	class Named(Struct):
+		__ATTRIBUTES__ = [StringParameter(name="name")]
+
+	with pytest.raises(TypeError):
+		BinaryCodec(Named)
+
+def test_pack():
+	codec = BinaryCodec(Sample)
+	sample = Sample(counter=3, value=0.5, valid=True, mode=Mode.RUNNING, level="high")
+	data = codec.pack(sample)
+	assert(data == struct.pack("<qd?BB", 3, 0.5, True, 1, 1))
+
+	unpacked = codec.unpack(data)
+	assert(unpacked == sample)
+	assert(unpacked.mode is Mode.RUNNING)
+	assert(unpacked.level == "high")
+
+	# Default values are packed too
+	assert(codec.unpack(codec.pack(Sample())) == Sample())
+
+	# Values must fit in their format
+	with pytest.raises(struct.error):
+		BinaryCodec(Sample, formats=dict(counter="B")).pack(Sample(counter=256))
+
+def test_keyword_ids():
+	class Range(Struct):
+		__ATTRIBUTES__ = [IntegerParameter(name="from"),
+		                  IntegerParameter(name="to")]
+
+	codec = BinaryCodec(Range, formats={"from": "i"})
+	interval = Range(**{"from": 1, "to": 3})
+	assert(codec.pack(interval) == struct.pack("<iq", 1, 3))
+	assert(codec.unpack(codec.pack(interval)) == interval)
+
+def test_pack_many():
+	codec = BinaryCodec(Sample, formats=dict(value="f"))
+	samples = [Sample(counter=i, value=i/2., valid=i%2, mode=list(Mode)[i%2]) for i in range(10)]
+	data = codec.packMany(samples)
+	assert(len(data) == 10*codec.size)
+	assert(codec.unpackMany(data) == samples)
+	assert(codec.unpackMany(bytearray(data)) == samples)
+	assert(codec.unpackMany(b"") == [])
+
+	with pytest.raises(struct.error):
+		codec.unpackMany(data[:-1])
@@ -29,6 +29,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 # Standard libraries
+import os
+import subprocess
 import sys
 
 # Third-party libraries
@@ -43,7 +45,11 @@ except ImportError as e:
 	qt_available = False
 
 # Local modules
-from strong_typing import Struct
+from strong_typing import (Struct,
+                           getTextualizeLimits,
+                           setTextualizeLimits,
+                           textualizeLimits)
+from strong_typing.typed_containers import TypedList
 from strong_typing.typed_parameters import *
 from strong_typing.typed_parameters.normalizers import *
 
@@ -88,8 +94,136 @@ def test_display(qtbot):
 	widget.show()
 	qtbot.waitForWindowShown(widget)
 
+@pytest.mark.skipif(sys.version_info < (3,7), reason="Lazy attributes require Python 3.7")
+def test_lazy_display_import():
+	# Importing the package must neither load the widget nor Qt
+	import strong_typing
+	package_root = os.path.dirname(os.path.dirname(os.path.abspath(strong_typing.__file__)))
+	environment = dict(os.environ)
+	environment["PYTHONPATH"] = os.pathsep.join([package_root, environment.get("PYTHONPATH", "")])
+	output = subprocess.check_output([sys.executable, "-c", "import sys, strong_typing; print(' '.join(sys.modules))"],
+	                                 env=environment,
+	                                 universal_newlines=True)
+	modules = output.split()
+	assert("strong_typing" in modules)
+	assert(not "strong_typing._display_widget" in modules)
+	assert(not "Qt" in modules)
+
 def test_textualize():
 	instance = SpecialTestStruct()
 	print(str(instance))
 	if sys.version_info < (3, 0):
 		print(unicode(instance))
+
+def test_textualize_output():
+	instance = SpecialTestStruct(str="two\nlines", vector_int=[1, 2], struct=InnerTestStruct(3))
+	expected = u"""
+├─ int: 0
+├─ ranged_int: 0
+├─ odd_int: 1
+├─ optional_int: None
+├─ float: 0.0
+├─ bool: False
+├─ str: two
+│  lines
+├─ str_with_default: lol
+├─ enum_from_list: a
+├─ enum_from_list_with_default: b
+├─ enum_from_enum: Choices.A
+├─ enum_from_enum_with_default: Choices.B
+├─ enum_from_enum_with_default2: Choices.B
+├─ vector_int: 
+│  ├─ 0: 1
+│  └─ 1: 2
+├─ optional_vector_int: []
+├─ struct: 
+│  ├─ int: 3
+│  └─ optional_float: None
+└─ struct_with_default: 
+   ├─ int: 5
+   └─ optional_float: 20.0"""
+	if sys.version_info < (3, 0):
+		assert(unicode(instance) == expected)
+		# Characters missing in ASCII are replaced
+		for tree_character, ascii_character in zip(u"├└─│", "||-|"):
+			expected = expected.replace(tree_character, ascii_character)
+		assert(str(instance) == expected)
+	else:
+		assert(str(instance) == expected)
+
+def test_textualize_limits():
+	# Tree characters are only written in unicode by Python 2
+	display_type = unicode if sys.version_info < (3, 0) else str
+	instance = SpecialTestStruct(vector_int=range(10), struct=InnerTestStruct(3))
+	full = display_type(instance)
+	assert(instance.textualize(display_type=display_type) == full)
+	assert(instance.textualize() == str(instance))
+
+	# Nested values are elided
+	text = instance.textualize(max_depth=1, display_type=display_type)
+	assert(u"\n├─ vector_int: [...]\n" in text)
+	assert(u"\n├─ struct: {...}\n" in text)
+	assert(u"\n├─ optional_vector_int: []\n" in text)
+	assert(text.endswith(u"\n└─ struct_with_default: {...}"))
+	assert(instance.textualize(max_depth=2, display_type=display_type) == full)
+
+	# Items of lists are elided, not parameters of structs
+	text = instance.textualize(max_items=3, display_type=display_type)
+	assert(u"\n│  ├─ 2: 2\n│  └─ ... (7 more items)\n├─ optional_vector_int" in text)
+	assert(text.endswith(u"└─ optional_float: 20.0"))
+	assert(str(TypedList(int, range(3))) == TypedList(int, range(3)).textualize(max_items=3))
+
+	# Text is cut
+	text = instance.textualize(max_length=50, display_type=display_type)
+	assert(len(text) == 50)
+	assert(full.startswith(text[:-3]))
+	assert(text.endswith("..."))
+	assert(instance.textualize(max_length=len(full), display_type=display_type) == full)
+
+	assert(TypedList(int).textualize(max_items=1) == "[]")
+
+def test_default_textualize_limits():
+	values = TypedList(int, range(5))
+	assert(getTextualizeLimits().max_items is None)
+	with textualizeLimits(max_items=2):
+		assert(getTextualizeLimits().max_items == 2)
+		assert(str(values) == values.textualize(max_items=2))
+	assert(str(values) == values.textualize())
+
+	setTextualizeLimits(max_length=20)
+	try:
+		assert(str(values) == values.textualize(max_length=20))
+	finally:
+		setTextualizeLimits()
+	assert(str(values) == values.textualize())
+
+class _RecordingStream(object):
+	def __init__(self):
+		self.writes = []
+
+	def write(self, text):
+		self.writes.append(text)
+
+def test_textualize_streaming():
+	instance = SpecialTestStruct(str="two\nlines", vector_int=range(10), struct=InnerTestStruct(3))
+	lines = list(instance.iterLines())
+	assert(lines[0] == "")
+	assert("\n".join(lines) == str(instance))
+	assert(len(lines) == str(instance).count("\n") + 1)
+	assert("\n".join(instance.iterLines(max_items=2, max_depth=2, max_length=200)) == instance.textualize(max_items=2, max_depth=2, max_length=200))
+	assert(list(TypedList(int).iterLines()) == ["[]"])
+
+	stream = _RecordingStream()
+	instance.writeTo(stream)
+	assert("".join(stream.writes) == str(instance))
+
+	# Long texts are written in several chunks
+	values = TypedList(int, range(20000))
+	stream = _RecordingStream()
+	values.writeTo(stream)
+	assert(len(stream.writes) > 1)
+	assert("".join(stream.writes) == str(values))
+
+	stream = _RecordingStream()
+	values.writeTo(stream, max_items=5)
+	assert("".join(stream.writes) == values.textualize(max_items=5))
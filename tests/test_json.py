@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard libraries
+import json
+
+# Third-party libraries
+import pytest
+
+# Local modules
+import strong_typing
+from strong_typing import Struct, VersionedStruct
+from strong_typing.typed_containers import TypedArray, TypedList
+from strong_typing.typed_parameters import *
+
+class Point(Struct):
+	__ATTRIBUTES__ = [FloatParameter(name="x"),
+	                  FloatParameter(name="y")]
+
+class Segment(Struct):
+	__ATTRIBUTES__ = [StructParameter(Point, name="start"),
+	                  StructParameter(Point, name="end"),
+	                  EnumParameter(["solid", "dashed"], name="style"),
+	                  StringParameter(name="label", default="segment"),
+	                  BoolParameter(name="visible", default=True)]
+
+class Drawing(Struct):
+	__ATTRIBUTES__ = [IntegerParameter(name="id"),
+	                  VectorParameter(float, name="weights", packed=True),
+	                  VectorParameter(str, name="tags"),
+	                  VectorParameter(Segment, name="segments"),
+	                  VectorParameter(Point, name="marks", lazy=True)]
+
+def sample():
+	return Drawing(id=3,
+	               weights=[0.5, 1.5],
+	               tags=["a", "b"],
+	               segments=[Segment(start=Point(x=1), end=Point(y=2), style="dashed"),
+	                         Segment(label="second", visible=False)],
+	               marks=[dict(x=4, y=5)])
+
+def test_round_trip():
+	drawing = sample()
+	text = drawing.toJson()
+	loaded = Drawing.fromJson(text)
+	assert(loaded == drawing)
+	assert(isinstance(loaded.weights, TypedArray))
+	assert(isinstance(loaded.segments, TypedList))
+	assert(loaded.segments.typename is Segment)
+	assert(loaded.segments[0].style == "dashed")
+	assert(loaded.segments[0].style is Segment().style.__class__["dashed"])
+	assert(loaded.marks.lazy)
+	assert(loaded.marks[0] == Point(x=4, y=5))
+
+	# Module-level helpers are the same
+	assert(strong_typing.loads(Drawing, strong_typing.dumps(drawing)) == drawing)
+	assert(strong_typing.dumps(drawing) == text)
+
+def test_json_layout():
+	data = json.loads(sample().toJson())
+	assert(data["id"] == 3)
+	assert(data["weights"] == [0.5, 1.5])
+	assert(data["segments"][0]["style"] == "dashed")
+	assert(data["segments"][0]["start"] == dict(x=1.0, y=0.0))
+	assert(data["segments"][1]["visible"] is False)
+	assert(strong_typing.toJsonObject(sample()) == data)
+	assert(strong_typing.fromJsonObject(Drawing, data) == sample())
+
+	# Extra arguments are given to json.dumps
+	assert("\n" in Point().toJson(indent=2))
+
+def test_defaults():
+	# Missing or null values keep their default
+	point = Point.fromJson('{"x": 1, "y": null}')
+	assert(point.x == 1.0 and isinstance(point.x, float))
+	assert(point.y == 0.0)
+	segment = Segment.fromJson('{}')
+	assert(segment == Segment())
+
+def test_keyword_ids():
+	class Range(Struct):
+		__ATTRIBUTES__ = [IntegerParameter(name="from"),
+		                  IntegerParameter(name="to")]
+
+	interval = Range(**{"from": 1, "to": 3})
+	assert(json.loads(interval.toJson()) == {"from": 1, "to": 3})
+	assert(Range.fromJson(interval.toJson()) == interval)
+
+def test_unknown_key():
+	with pytest.raises(TypeError):
+		Point.fromJson('{"x": 1, "z": 2}')
+
+def test_versioned():
+	class Versioned(VersionedStruct):
+		__VERSION__ = "1.1"
+		__ATTRIBUTES__ = [IntegerParameter(name="a"),
+		                  IntegerParameter(name="b")]
+		__ATT_VERSIONS__ = [None, "1.1"]
+
+		@classmethod
+		def _fromOldDict(cls, data, version):
+			data["b"] = data["a"]
+			return cls(**data)
+
+	versioned = Versioned(a=1, b=2)
+	assert(json.loads(versioned.toJson())["version"] == "1.1")
+	assert(Versioned.fromJson(versioned.toJson()) == versioned)
+
+	# Older data is migrated
+	assert(Versioned.fromJson('{"version": "1.0", "a": 3}') == Versioned(a=3, b=3))
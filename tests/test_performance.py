@@ -0,0 +1,783 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Benchmarks are marked, and only run with ``--benchmark`` (see conftest.py).
+# Timings are compared to a reference path measured in the same run, taking the
+# best of several repetitions to limit the noise.
+
+# Standard libraries
+import collections
+import enum
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+# Third-party libraries
+import pytest
+
+# Local modules
+from strong_typing import Struct, VersionedStruct, BinaryCodec, StructFile, toJsonObject, fromJsonObject
+from strong_typing import Fill, Rename, Transform
+from strong_typing import _textualize
+from strong_typing.typed_containers import StructArray, TypedArray, TypedList
+from strong_typing.typed_parameters import *
+
+def best_time(function, number=1000, repeat=5):
+	return min(timeit.repeat(function, number=number, repeat=repeat))
+
+def speedup(reference, candidate, number=1000, repeat=9):
+	"""
+	Returns how many times ``candidate`` is faster than ``reference``
+
+	Both are timed alternately, so that a load peak does not only slow one of
+	them down.
+	"""
+	reference_times = []
+	candidate_times = []
+	for i in range(repeat):
+		reference_times.append(timeit.timeit(reference, number=number))
+		candidate_times.append(timeit.timeit(candidate, number=number))
+	return min(reference_times)/min(candidate_times)
+
+class BenchmarkStruct(Struct):
+	__ATTRIBUTES__= [
+		IntegerParameter(name="int"),
+		IntegerParameter(name="ranged_int", range=[0,10]),
+		FloatParameter(name="float"),
+		BoolParameter(name="bool"),
+		StringParameter(name="str"),
+	]
+
+@pytest.mark.benchmark
+def test_compiled_init_speed():
+	def legacy_setattr(instance, name, value):
+		# Checks originally done by Struct.__setattr__
+		keys = list(instance.keys())
+		if (not name in keys) and (not name[1:] in keys):
+			raise AttributeError(name)
+		object.__setattr__(instance, name, value)
+
+	def legacy_init(instance, *args, **kwargs):
+		# Path originally taken by the constructor: one setattr per argument
+		for i in range(len(args)):
+			legacy_setattr(instance, instance.__ATTRIBUTES__[i].id, args[i])
+		for key, value in kwargs.items():
+			legacy_setattr(instance, key, value)
+
+	def legacy():
+		instance = BenchmarkStruct.__new__(BenchmarkStruct)
+		legacy_init(instance, 1, 2, float=3.0, bool=True, str="a")
+
+	def compiled():
+		BenchmarkStruct(1, 2, float=3.0, bool=True, str="a")
+
+	assert(speedup(legacy, compiled, number=5000) > 3)
+
+@pytest.mark.benchmark
+def test_setattr_flat_cost():
+	def makeStruct(field_count):
+		attributes = [IntegerParameter(name="field_%d"%i) for i in range(field_count)]
+		return type("Struct%d"%field_count, (Struct,), dict(__ATTRIBUTES__=attributes))()
+
+	small = makeStruct(5)
+	large = makeStruct(80)
+
+	def setSmall():
+		small.field_4 = 1
+
+	def setLarge():
+		large.field_79 = 1
+
+	assert(speedup(setLarge, setSmall, number=50000) < 2)
+
+@pytest.mark.benchmark
+def test_class_creation_time():
+	class InnerStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a"), StringParameter(name="b")]
+
+	def createClasses():
+		for i in range(500):
+			type("GeneratedStruct%d"%i, (Struct,), dict(__ATTRIBUTES__=[
+				IntegerParameter(name="int", range=[0,10]),
+				FloatParameter(name="float"),
+				BoolParameter(name="bool"),
+				StringParameter(name="str"),
+				EnumParameter(name="enum", choices=["a", "b", "c"]),
+				VectorParameter(type=int, name="vector"),
+				StructParameter(type=InnerStruct, name="struct", default=InnerStruct(1, "a")),
+			]))
+
+	assert(best_time(createClasses, number=1, repeat=3) < 0.5)
+
+@pytest.mark.benchmark
+def test_schema_import_time(tmpdir):
+	# Each class nests the previous one as default value, so building their
+	# documentation at import time would textualize ever deeper structures
+	source = "from strong_typing import Struct\n"
+	source += "from strong_typing.typed_parameters import *\n"
+	source += "class Struct0(Struct):\n"
+	source += "\t__ATTRIBUTES__ = [IntegerParameter(name='value')]\n"
+	for i in range(1, 50):
+		source += "class Struct%d(Struct):\n"%i
+		source += "\t__ATTRIBUTES__ = [IntegerParameter(name='value'),\n"
+		source += "\t                  StructParameter(type=Struct%d, name='inner', default=Struct%d())]\n"%(i-1, i-1)
+	tmpdir.join("benchmark_schema.py").write(source)
+
+	sys.path.insert(0, str(tmpdir))
+	try:
+		start = timeit.default_timer()
+		import benchmark_schema
+		duration = timeit.default_timer() - start
+	finally:
+		sys.path.remove(str(tmpdir))
+		sys.modules.pop("benchmark_schema", None)
+
+	assert(duration < 0.5)
+	assert(":class:`Struct0`" in benchmark_schema.Struct1.__doc__)
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(sys.version_info < (3,7), reason="-X importtime requires Python 3.7")
+def test_package_import_time():
+	import strong_typing
+	package_root = os.path.dirname(os.path.dirname(os.path.abspath(strong_typing.__file__)))
+	environment = dict(os.environ)
+	environment["PYTHONPATH"] = os.pathsep.join([package_root, environment.get("PYTHONPATH", "")])
+	output = subprocess.check_output([sys.executable, "-X", "importtime", "-c", "import strong_typing"],
+	                                 stderr=subprocess.STDOUT,
+	                                 env=environment,
+	                                 universal_newlines=True)
+
+	# Lines are "import time: self [us] | cumulative | imported package"
+	imported = dict()
+	for line in output.splitlines():
+		if line.startswith("import time:") and not "cumulative" in line:
+			_, cumulative, package = line.split("|")
+			imported[package.strip()] = int(cumulative)
+
+	# Modules not loaded are checked in test_display
+	assert(imported["strong_typing"] < 200000)
+
+@pytest.mark.benchmark
+def test_trusted_construction_speed():
+	values = dict(int=1, ranged_int=2, float=3.0, bool=True, str="a")
+
+	def checked():
+		BenchmarkStruct(**values)
+
+	def trusted():
+		BenchmarkStruct._fromTrusted(values)
+
+	assert(speedup(checked, trusted, number=5000) > 1.5)
+
+@pytest.mark.benchmark
+def test_copy_constructor_speed():
+	class ConfigStruct(Struct):
+		__ATTRIBUTES__= [
+			StructParameter(name="first", type=BenchmarkStruct),
+			StructParameter(name="second", type=BenchmarkStruct),
+			VectorParameter(name="values", type=float, default=list(range(50))),
+			VectorParameter(name="items", type=BenchmarkStruct, default=[BenchmarkStruct()]*10),
+		]
+
+	source = ConfigStruct()
+	for key in source:
+		source[key]
+
+	def legacy():
+		ConfigStruct(**source)
+
+	def copied():
+		ConfigStruct(source)
+
+	assert(ConfigStruct(source) == ConfigStruct(**source))
+	assert(speedup(legacy, copied, number=200) > 1.8)
+
+@pytest.mark.benchmark
+def test_nested_ownership_speed():
+	def makeSchema(ownership, depth=5):
+		schema = BenchmarkStruct
+		for level in range(depth):
+			attributes = [
+				StructParameter(name="child", type=schema, ownership=ownership),
+				VectorParameter(name="values", type=float, default=list(range(100)), ownership=ownership),
+			]
+			schema = type("Level%d"%level, (Struct,), dict(__ATTRIBUTES__=attributes))
+		return schema
+
+	def makeAssignment(ownership):
+		schema = makeSchema(ownership)
+		value = schema.__ATTRIBUTES__[0].type()
+		instance = schema()
+
+		def assign():
+			instance.child = value
+
+		assign()
+		assert(instance.child == value)
+		return assign
+
+	assignments = dict((ownership, makeAssignment(ownership)) for ownership in Ownership)
+	assert(speedup(assignments[Ownership.COPY], assignments[Ownership.CLONE], number=200) > 1.4)
+	assert(speedup(assignments[Ownership.CLONE], assignments[Ownership.TAKE], number=1000) > 1.2)
+
+@pytest.mark.benchmark
+def test_numeric_normalizer_speed():
+	def legacy_normalizer(parameter, normalizer):
+		# Closure originally wrapping every numeric normalizer
+		def _normalizer(x):
+			if x is None:
+				return None
+			x = normalizer(x)
+			if not parameter.range[0] is None and x < parameter.range[0]:
+				x = parameter.range[0]
+			if not parameter.range[1] is None and x > parameter.range[1]:
+				x = parameter.range[1]
+			return x
+		return _normalizer
+
+	plain = IntegerParameter(name="plain")
+	ranged = IntegerParameter(name="ranged", range=[0,10])
+	legacy_plain = legacy_normalizer(plain, int)
+	legacy_ranged = legacy_normalizer(ranged, int)
+	specialized_plain = plain.valueNormalizer
+	specialized_ranged = ranged.valueNormalizer
+
+	def legacy():
+		legacy_plain(5)
+		legacy_ranged(12)
+
+	def specialized():
+		specialized_plain(5)
+		specialized_ranged(12)
+
+	assert(speedup(legacy, specialized, number=20000) > 1.3)
+
+@pytest.mark.benchmark
+def test_enum_speed():
+	parameter = EnumParameter(name="state", choices=["idle", "moving", "stopped"])
+	choices = parameter.choices
+	moving, stopped = choices["moving"], choices["stopped"]
+
+	def legacy_normalizer(x):
+		# Lookup originally done by the normalizer
+		if isinstance(x, enum.Enum):
+			return choices(x)
+		else:
+			return choices[x]
+
+	normalizer = parameter.valueNormalizer
+
+	def legacyAssignment():
+		legacy_normalizer("moving")
+		legacy_normalizer(moving)
+
+	def indexedAssignment():
+		normalizer("moving")
+		normalizer(moving)
+
+	class LegacyState(enum.Enum):
+		idle = 0
+		moving = 1
+		stopped = 2
+
+		def __eq__(self, other):
+			# Comparison originally done by enums built from a list
+			if isinstance(other, str):
+				return self.name == other
+			elif isinstance(other, type(self)):
+				return self.name == other.name
+			else:
+				return False
+
+	legacy_moving, legacy_stopped = LegacyState.moving, LegacyState.stopped
+
+	def legacyComparison():
+		legacy_moving == legacy_moving
+		legacy_moving == legacy_stopped
+		legacy_moving == "moving"
+
+	def comparison():
+		moving == moving
+		moving == stopped
+		moving == "moving"
+
+	assert(speedup(legacyAssignment, indexedAssignment, number=20000) > 1.2)
+	assert(speedup(legacyComparison, comparison, number=20000) > 1.5)
+
+@pytest.mark.benchmark
+def test_enum_from_list_creation_time():
+	choices = ["idle", "moving", "stopped", "error"]
+	counter = [0]
+
+	def distinctChoices():
+		# Each parameter creates its own enum, as all of them used to do
+		counter[0] += 1
+		EnumParameter(name="state", choices=choices+["state_%d"%counter[0]])
+
+	def sharedChoices():
+		EnumParameter(name="state", choices=choices)
+
+	assert(speedup(distinctChoices, sharedChoices, number=100) > 3)
+
+@pytest.mark.benchmark
+def test_bool_normalizer_speed():
+	def legacy_normalizer(x):
+		# Normalizer originally used by BoolParameter
+		if x is None:
+			return None
+		try:
+			if int(x)==0:
+				return False
+		except ValueError:
+			pass
+
+		return False if x in ["False", "false"] else bool(x)
+
+	normalizer = BoolParameter(name="bool").valueNormalizer
+	inputs = [True, False, 0, 1, "true", "false", "yes", "on", "1", "0"]
+
+	def legacy():
+		for x in inputs:
+			legacy_normalizer(x)
+
+	def tableDriven():
+		for x in inputs:
+			normalizer(x)
+
+	assert([legacy_normalizer(x) for x in inputs] == [normalizer(x) for x in inputs])
+	assert(speedup(legacy, tableDriven, number=2000) > 2)
+
+@pytest.mark.benchmark
+def test_typed_array_speed():
+	# Integer samples, that both containers must convert
+	samples = list(range(100000))
+
+	def typedList():
+		TypedList(float, samples)
+
+	def typedArray():
+		TypedArray(float, samples)
+
+	assert(speedup(typedList, typedArray, number=1, repeat=5) > 3)
+
+	# Samples are stored in 8 bytes each (plus some room to grow), instead of
+	# a pointer and a float object
+	assert(sys.getsizeof(TypedArray(float, samples)) < 9*len(samples))
+
+@pytest.mark.benchmark
+def test_typed_list_extend_speed():
+	values = list(range(1000000))
+	typed_values = TypedList(int, values)
+
+	def legacy_check(typename, element):
+		# Check originally done by TypedList._checkType
+		try:
+			if isinstance(element, typename):
+				return element
+			elif issubclass(typename, Struct) and isinstance(element, dict):
+				return typename(**element)
+			else:
+				return typename(element)
+		except Exception as e:
+			raise TypeError()
+
+	def legacy_extend(typed_list, iterable):
+		# Extension originally done, checking the elements one by one
+		list_to_extend = []
+		for element in iterable:
+			list_to_extend.append(legacy_check(int, element))
+		list.extend(typed_list, list_to_extend)
+
+	def legacyFromList():
+		legacy_extend(TypedList(int), values)
+
+	def legacyFromTypedList():
+		legacy_extend(TypedList(int), typed_values)
+
+	def fromList():
+		TypedList(int).extend(values)
+
+	def fromTypedList():
+		TypedList(int).extend(typed_values)
+
+	assert(speedup(legacyFromList, fromList, number=1, repeat=5) > 2)
+	assert(speedup(legacyFromTypedList, fromTypedList, number=1, repeat=5) > 5)
+
+@pytest.mark.benchmark
+def test_lazy_typed_list_speed():
+	records = [dict(int=i, ranged_int=i%10, float=i/2., bool=i%2, str=str(i)) for i in range(20000)]
+
+	def eager():
+		records_list = TypedList(BenchmarkStruct, records)
+		for i in range(0, 20000, 2000):
+			records_list[i].int
+
+	def lazy():
+		records_list = TypedList(BenchmarkStruct, records, lazy=True)
+		for i in range(0, 20000, 2000):
+			records_list[i].int
+
+	assert(speedup(eager, lazy, number=1, repeat=3) > 10)
+
+	# Memory allocated by each kind of list
+	tracemalloc = pytest.importorskip("tracemalloc")
+	tracemalloc.start()
+	try:
+		start = tracemalloc.get_traced_memory()[0]
+		eager_list = TypedList(BenchmarkStruct, records)
+		eager_list[0].int
+		eager_size = tracemalloc.get_traced_memory()[0] - start
+		lazy_list = TypedList(BenchmarkStruct, records, lazy=True)
+		lazy_list[0].int
+		lazy_size = tracemalloc.get_traced_memory()[0] - start - eager_size
+	finally:
+		tracemalloc.stop()
+	assert(lazy_size*5 < eager_size)
+
+class JsonPoint(Struct):
+	__ATTRIBUTES__ = [FloatParameter(name="x"),
+	                  FloatParameter(name="y")]
+
+class JsonSegment(Struct):
+	__ATTRIBUTES__ = [StructParameter(JsonPoint, name="start"),
+	                  StructParameter(JsonPoint, name="end"),
+	                  EnumParameter(["solid", "dashed", "dotted"], name="style"),
+	                  StringParameter(name="label"),
+	                  BoolParameter(name="visible")]
+
+class JsonDrawing(Struct):
+	__ATTRIBUTES__ = [IntegerParameter(name="id"),
+	                  StringParameter(name="name"),
+	                  VectorParameter(float, name="weights"),
+	                  VectorParameter(JsonSegment, name="segments")]
+
+@pytest.mark.benchmark
+def test_json_speed():
+	drawing = JsonDrawing(id=1,
+	                      name="drawing",
+	                      weights=[i/3. for i in range(20)],
+	                      segments=[dict(start=dict(x=i, y=i+1),
+	                                     end=dict(x=i+2, y=i+3),
+	                                     style=["solid", "dashed", "dotted"][i%3],
+	                                     label=str(i),
+	                                     visible=i%2==0) for i in range(20)])
+	text = drawing.toJson()
+
+	def toGeneric(value):
+		# Conversion without knowledge of the schema
+		if isinstance(value, Struct):
+			return dict((key, toGeneric(value[key])) for key in value.keys())
+		elif isinstance(value, enum.Enum):
+			return value.name
+		elif isinstance(value, (list, TypedArray)):
+			return [toGeneric(element) for element in value]
+		return value
+
+	def genericDumps():
+		json.dumps(toGeneric(drawing))
+
+	def genericLoads():
+		JsonDrawing(**json.loads(text))
+
+	def dumps():
+		drawing.toJson()
+
+	def loads():
+		JsonDrawing.fromJson(text)
+
+	assert(JsonDrawing.fromJson(text) == JsonDrawing(**json.loads(text)))
+	assert(json.loads(text) == toGeneric(drawing))
+	assert(speedup(genericDumps, dumps, number=200) > 2)
+	assert(speedup(genericLoads, loads, number=200) > 1.3)
+
+class TelemetrySample(Struct):
+	__ATTRIBUTES__ = [IntegerParameter(name="timestamp"),
+	                  IntegerParameter(name="sensor"),
+	                  FloatParameter(name="value"),
+	                  BoolParameter(name="valid"),
+	                  EnumParameter(["nominal", "warning", "error"], name="status")]
+
+@pytest.mark.benchmark
+def test_binary_speed():
+	samples = [TelemetrySample(timestamp=i, sensor=i%16, value=i/7., valid=i%5!=0,
+	                           status=["nominal", "warning", "error"][i%3]) for i in range(1000)]
+	codec = BinaryCodec(TelemetrySample, formats=dict(sensor="H"))
+	text = json.dumps([toJsonObject(sample) for sample in samples])
+	data = codec.packMany(samples)
+
+	def jsonDumps():
+		json.dumps([toJsonObject(sample) for sample in samples])
+
+	def jsonLoads():
+		[fromJsonObject(TelemetrySample, sample) for sample in json.loads(text)]
+
+	def packMany():
+		codec.packMany(samples)
+
+	def unpackMany():
+		codec.unpackMany(data)
+
+	assert(codec.unpackMany(data) == samples)
+	assert(len(data)*3 < len(text))
+	assert(speedup(jsonDumps, packMany, number=20) > 1.3)
+	assert(speedup(jsonLoads, unpackMany, number=20) > 2)
+
+@pytest.mark.benchmark
+def test_struct_file_speed(tmpdir):
+	path = str(tmpdir.join("telemetry.bin"))
+	codec = BinaryCodec(TelemetrySample)
+	StructFile.write(path, codec, (TelemetrySample(timestamp=i, value=i/7.) for i in range(200000)))
+
+	def parseAll():
+		with open(path, "rb") as f:
+			samples = codec.unpackMany(f.read())
+		assert(samples[123456].timestamp == 123456)
+
+	def mapped():
+		with StructFile(path, codec) as samples:
+			assert(samples[123456].timestamp == 123456)
+
+	assert(speedup(parseAll, mapped, number=1, repeat=3) > 100)
+
+@pytest.mark.benchmark
+def test_struct_array_speed():
+	rows = [dict(int=i, ranged_int=i%10, float=i/2., bool=i%2==0, str=str(i%50)) for i in range(100000)]
+	records_list = TypedList(BenchmarkStruct, rows)
+	records_array = StructArray(BenchmarkStruct, rows)
+
+	def buildList():
+		TypedList(BenchmarkStruct, rows)
+
+	def buildArray():
+		StructArray(BenchmarkStruct, rows)
+
+	def sumList():
+		sum(record.float for record in records_list)
+
+	def sumArray():
+		sum(records_array.column("float"))
+
+	def filterList():
+		[record for record in records_list if record.str == "7"]
+
+	def filterArray():
+		records_array.filter(str="7")
+
+	assert(speedup(buildList, buildArray, number=1, repeat=5) > 1.2)
+	assert(speedup(sumList, sumArray, number=10, repeat=3) > 10)
+	assert(speedup(filterList, filterArray, number=10, repeat=3) > 1.2)
+
+	# Memory allocated by each container
+	tracemalloc = pytest.importorskip("tracemalloc")
+	tracemalloc.start()
+	try:
+		start = tracemalloc.get_traced_memory()[0]
+		records_list = TypedList(BenchmarkStruct, rows)
+		list_size = tracemalloc.get_traced_memory()[0] - start
+		records_array = StructArray(BenchmarkStruct, rows)
+		array_size = tracemalloc.get_traced_memory()[0] - start - list_size
+	finally:
+		tracemalloc.stop()
+	assert(array_size*2 < list_size)
+
+@pytest.mark.benchmark
+def test_textualize_speed():
+	def legacy_str(value):
+		# Textualization originally done by TextualizeMixin
+		if isinstance(value, _textualize.TextualizeMixin):
+			if isinstance(value, collections.Mapping):
+				return legacy_textualize(list(value.keys()), value) if len(value) else "{}"
+			return legacy_textualize(range(len(value)), value) if len(value) else "[]"
+		return str(value)
+
+	def legacy_textualize(keys, map):
+		res_str = ""
+		for key in keys:
+			value = map[key]
+			value = value if value != "" else "\"\""
+			if key != keys[-1]:
+				res_str += "\n" + _textualize.TREE_MID_INDENT(str)
+				indent_level = _textualize.AFTER_MID_INDENT(str)
+			else:
+				res_str += "\n" + _textualize.TREE_LAST_INDENT(str)
+				indent_level = _textualize.AFTER_LAST_INDENT(str)
+			res_str += str(key) + ": "
+			res_str += legacy_str(value).replace("\n","\n"+(indent_level))
+		return res_str
+
+	def nested(depth, width):
+		value = TypedList(int, range(width))
+		for i in range(depth):
+			value = TypedList(TypedList, [value])
+		return value
+
+	deep = nested(60, 1000)
+	wide = nested(0, 20000)
+	assert(str(deep) == legacy_str(deep))
+	assert(str(wide) == legacy_str(wide))
+	assert(speedup(lambda: legacy_str(deep), lambda: str(deep), number=3, repeat=7) > 3)
+	assert(speedup(lambda: legacy_str(wide), lambda: str(wide), number=3, repeat=7) > 1.5)
+
+	# Time grows with the length of the text, which doubles with the depth of
+	# the tree (each line is indented once more per level), and no longer with
+	# its square
+	wider = nested(0, 40000)
+	deeper = nested(120, 1000)
+	assert(speedup(lambda: str(wider), lambda: str(wide), number=3, repeat=7) > 1.3)
+	assert(speedup(lambda: str(deeper), lambda: str(deep), number=3, repeat=7) < 3)
+
+@pytest.mark.benchmark
+def test_bounded_textualize_speed():
+	class Log(Struct):
+		__ATTRIBUTES__ = [StringParameter(name="source"),
+		                  VectorParameter(float, name="samples")]
+
+	log = Log(source="imu", samples=[i/3. for i in range(500000)])
+
+	def full():
+		str(log)
+
+	def bounded():
+		log.textualize(max_items=20)
+
+	def cut():
+		log.textualize(max_length=1000)
+
+	assert(speedup(full, bounded, number=1, repeat=3) > 100)
+	assert(speedup(full, cut, number=1, repeat=3) > 100)
+
+@pytest.mark.benchmark
+def test_streaming_textualize():
+	class NullStream(object):
+		def write(self, text):
+			pass
+
+	values = TypedList(float, [i/3. for i in range(200000)])
+
+	def firstLine():
+		lines = values.iterLines()
+		next(lines)
+		next(lines)
+
+	# Output starts without waiting for the whole text
+	assert(speedup(lambda: str(values), firstLine, number=1, repeat=3) > 100)
+
+	tracemalloc = pytest.importorskip("tracemalloc")
+	def peakMemory(function):
+		tracemalloc.start()
+		try:
+			function()
+			return tracemalloc.get_traced_memory()[1]
+		finally:
+			tracemalloc.stop()
+
+	assert(peakMemory(lambda: values.writeTo(NullStream()))*20 < peakMemory(lambda: str(values)))
+
+class BenchmarkVersionedStruct(VersionedStruct):
+	__VERSION__ = "1.2"
+	__ATTRIBUTES__ = [IntegerParameter(name="int"),
+	                  FloatParameter(name="float")]
+	__ATT_VERSIONS__ = [None, "1.1"]
+
+	@classmethod
+	def _fromOldDict(cls, data, version):
+		data.setdefault("float", float(data["int"]))
+		return cls(**data)
+
+@pytest.mark.benchmark
+@pytest.mark.filterwarnings("ignore:distutils Version classes are deprecated")
+def test_versioned_from_dict_speed():
+	StrictVersion = pytest.importorskip("distutils.version").StrictVersion
+	records = [dict(version=["1.0", "1.1", "1.2", "1.2.0"][i%4], int=i) for i in range(2000)]
+
+	def legacy_from_dict(cls, data):
+		# Resolution originally done by VersionedStruct.fromDict
+		if "version" in data.keys():
+			version = StrictVersion(data.pop("version"))
+			if version < StrictVersion(cls.__VERSION__):
+				return cls._fromOldDict(data, version)
+		return cls(**data)
+
+	def legacy():
+		for record in records:
+			legacy_from_dict(BenchmarkVersionedStruct, dict(record))
+
+	def cached():
+		for record in records:
+			BenchmarkVersionedStruct.fromDict(dict(record))
+
+	assert([legacy_from_dict(BenchmarkVersionedStruct, dict(record)) for record in records[:4]]
+	       == [BenchmarkVersionedStruct.fromDict(dict(record)) for record in records[:4]])
+	assert(speedup(legacy, cached, number=5, repeat=5) > 1.7)
+
+class BenchmarkMigratedStruct(VersionedStruct):
+	__VERSION__ = "1.3"
+	__ATTRIBUTES__ = [IntegerParameter(name="int"),
+	                  FloatParameter(name="float"),
+	                  StringParameter(name="str")]
+	__ATT_VERSIONS__ = [None, "1.2", None]
+	__DEPRECATED_ATT_N_VERSIONS__ = [(BoolParameter(name="bool"), None, "1.3")]
+	__MIGRATIONS__ = {"1.1": [Rename("integer", "int")],
+	                  "1.2": [Fill("float", function=lambda data: float(data["int"]))],
+	                  "1.3": [Transform("str", str.strip)]}
+
+class BenchmarkHandMigratedStruct(VersionedStruct):
+	__VERSION__ = "1.3"
+	__ATTRIBUTES__ = BenchmarkMigratedStruct.__ATTRIBUTES__
+
+	@classmethod
+	def _fromOldDict(cls, data, version):
+		if version < "1.1":
+			data["int"] = data.pop("integer")
+		if version < "1.2":
+			data.setdefault("float", float(data["int"]))
+		if version < "1.3":
+			data["str"] = data["str"].strip()
+			data.pop("bool", None)
+		return cls(**data)
+
+@pytest.mark.benchmark
+def test_declarative_migration_speed():
+	records = [dict(version="1.0", integer=i, str=" %d "%i, bool=True) for i in range(1000)]
+	records += [dict(version="1.2", int=i, float=0.5, str=" %d "%i, bool=True) for i in range(1000)]
+
+	def hand_written():
+		for record in records:
+			BenchmarkHandMigratedStruct.fromDict(dict(record))
+
+	def declarative():
+		for record in records:
+			BenchmarkMigratedStruct.fromDict(dict(record))
+
+	assert([list(BenchmarkHandMigratedStruct.fromDict(dict(record)).values()) for record in records[::1000]]
+	       == [list(BenchmarkMigratedStruct.fromDict(dict(record)).values()) for record in records[::1000]])
+	assert(speedup(hand_written, declarative, number=5, repeat=7) > 1.2)
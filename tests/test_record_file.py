@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard libraries
+import os
+
+# Third-party libraries
+import pytest
+
+# Local modules
+from strong_typing import Struct, BinaryCodec, StructRecordArray, StructFile
+from strong_typing.typed_parameters import *
+
+class State(Struct):
+	__ATTRIBUTES__ = [IntegerParameter(name="step"),
+	                  FloatParameter(name="position"),
+	                  FloatParameter(name="speed", range=(0, 10)),
+	                  EnumParameter(["stopped", "moving"], name="status")]
+
+CODEC = BinaryCodec(State, formats=dict(step="I", position="f"))
+
+def states(count):
+	return [State(step=i, position=i/4., speed=i%10, status=["stopped", "moving"][i%2]) for i in range(count)]
+
+def test_record_array():
+	records = StructRecordArray(CODEC, bytearray(CODEC.packMany(states(10))))
+	assert(len(records) == 10)
+	assert(records.codec is CODEC)
+	assert(records[3].step == 3)
+	assert(records[3].position == 0.75)
+	assert(records[3].status == "moving")
+	assert(records[-1].step == 9)
+	assert(records[3] == states(4)[3])
+	assert(records[3].toStruct() == states(4)[3])
+	assert(sorted(records[3].keys()) == ["position", "speed", "status", "step"])
+	assert(records[3]["step"] == 3)
+	assert(dict(records[3]) == dict(states(4)[3]))
+	assert([record.step for record in records] == list(range(10)))
+	assert([record.step for record in records[2:8:3]] == [2, 5])
+	assert(records.toList() == states(10))
+
+	with pytest.raises(IndexError):
+		records[10]
+	with pytest.raises(ValueError):
+		StructRecordArray(CODEC, bytearray(CODEC.size+1))
+
+	# A Struct class is enough to read records packed with the default format
+	assert(StructRecordArray(State, BinaryCodec(State).packMany(states(3)))[2].step == 2)
+
+def test_record_writing():
+	buffer = bytearray(CODEC.packMany(states(5)))
+	records = StructRecordArray(CODEC, buffer)
+
+	# Values are normalized before being written
+	records[1].speed = 12
+	records[1].status = "stopped"
+	records[1].step += 10
+	assert(records[1].speed == 10)
+	assert(records[1].status == "stopped")
+	assert(CODEC.unpack(bytes(buffer[CODEC.size:2*CODEC.size])).step == 11)
+	with pytest.raises(KeyError):
+		records[1].status = "unknown"
+
+	# None and "" give the default value
+	records[1].speed = None
+	records[3].status = ""
+	assert(records[1].speed == 0.)
+	assert(records[3].status == "stopped")
+
+	records[2] = State(step=42)
+	records[3] = dict(step=43)
+	assert(records[2] == State(step=42))
+	assert(records[3] == State(step=43))
+	with pytest.raises(TypeError):
+		records[4] = 44
+
+def test_struct_file(tmpdir):
+	path = str(tmpdir.join("states.bin"))
+	StructFile.write(path, CODEC, states(5000))
+	StructFile.write(path, CODEC, states(3), append=True)
+	assert(os.path.getsize(path) == 5003*CODEC.size)
+
+	with StructFile(path, CODEC) as records:
+		assert(len(records) == 5003)
+		assert(records[4321] == states(4322)[4321])
+		assert(records[-1].step == 2)
+		with pytest.raises(TypeError):
+			records[0].step = 1
+
+	with StructFile(path, CODEC, writable=True) as records:
+		records[4321].position = -1
+		records.flush()
+	with StructFile(path, CODEC) as records:
+		assert(records[4321].position == -1)
+
+	# Empty files cannot be mapped, but can be opened
+	StructFile.write(path, CODEC, [])
+	with StructFile(path, CODEC) as records:
+		assert(len(records) == 0)
+		assert(records.toList() == [])
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Third-party libraries
+import pytest
+
+# Local modules
+from strong_typing import Struct
+from strong_typing.typed_containers import StructArray, TypedArray, TypedList
+from strong_typing.typed_parameters import *
+
+class Joint(Struct):
+	__ATTRIBUTES__ = [StringParameter(name="name"),
+	                  FloatParameter(name="speed", range=(0, 10)),
+	                  IntegerParameter(name="step"),
+	                  BoolParameter(name="enabled", default=True),
+	                  EnumParameter(["stopped", "moving"], name="status"),
+	                  VectorParameter(float, name="limits", default=[-1., 1.])]
+
+def joints():
+	return [Joint(name="joint%d"%(i%3), speed=i, step=i*10, enabled=i%2, status=["stopped", "moving"][i%2]) for i in range(6)]
+
+def test_default():
+	a = StructArray(Joint)
+	assert(len(a) == 0)
+	assert(a.typename is Joint)
+	assert(a == [])
+	assert(str(a) == "[]")
+	with pytest.raises(TypeError):
+		StructArray(int)
+
+def test_rows():
+	a = StructArray(Joint, joints())
+	assert(len(a) == 6)
+	assert(a == joints())
+	assert(a.toList() == joints())
+	assert(isinstance(a.toList(), TypedList))
+
+	# Dicts are normalized, missing values take their default
+	a.append(dict(name="extra", speed=12))
+	assert(a[-1] == Joint(name="extra", speed=10))
+	assert(a[6].enabled is True)
+	assert(a[6].limits == [-1., 1.])
+	with pytest.raises(TypeError):
+		a.append(dict(unknown=1))
+	with pytest.raises(TypeError):
+		a.append(3)
+	with pytest.raises(IndexError):
+		a[7]
+
+def test_views():
+	a = StructArray(Joint, joints())
+	view = a[1]
+	assert(view.name == "joint1")
+	assert(view.speed == 1.)
+	assert(view.status == "moving")
+	assert(view["step"] == 10)
+	assert(sorted(view.keys()) == sorted(Joint().keys()))
+	assert(view == joints()[1])
+	assert(view.toStruct() == joints()[1])
+	assert(dict(view) == dict(joints()[1]))
+	assert(view.get("step") == 10 and view.get("unknown") is None)
+	assert(sorted(view.items()) == sorted(joints()[1].items()))
+	assert(len(view.values()) == len(Joint.__ATTRIBUTES__))
+	assert("├" in str(view) or "|" in str(view))
+
+	# Writes are normalized and stored in the columns
+	view.speed = 20
+	view.status = "stopped"
+	view.name = "renamed"
+	assert(a[1].speed == 10.)
+	assert(a.column("speed")[1] == 10.)
+	assert(a.column("status")[1] == "stopped")
+	assert(a.column("name")[1] == "renamed")
+
+	a[2] = Joint(name="replaced")
+	assert(a[2] == Joint(name="replaced"))
+
+	# Mutable values are not shared with the rows they come from
+	joint = Joint()
+	a.append(joint)
+	joint.limits.append(2.)
+	assert(a[-1].limits == [-1., 1.])
+
+def test_columns():
+	a = StructArray(Joint, joints())
+	speeds = a.column("speed")
+	assert(isinstance(speeds, TypedArray))
+	assert(sum(speeds) == 15.)
+	assert(max(a.column("step")) == 50)
+	assert(a.column("enabled") == [False, True]*3)
+	assert(a.column("name") == ["joint0", "joint1", "joint2"]*2)
+
+	# Numeric columns are not copies
+	speeds[0] = 5.
+	assert(a[0].speed == 5.)
+
+	with pytest.raises(KeyError):
+		a.column("unknown")
+
+def test_slicing_and_filtering():
+	a = StructArray(Joint, joints())
+	assert(a[1:4] == joints()[1:4])
+	assert(a[::-2] == joints()[::-2])
+	assert(isinstance(a[1:4], StructArray))
+
+	assert(a.filter(status="moving") == joints()[1::2])
+	assert(a.filter(name="joint0", enabled=False) == [joints()[0]])
+	assert(a.filter(name="nothing") == [])
+	assert(a.compress([speed > 2 for speed in a.column("speed")]) == joints()[3:])
+	with pytest.raises(TypeError):
+		a.filter(unknown=1)
+
+	# Results are independent from the original array
+	b = a[0:2]
+	b[0].step = 100
+	assert(a[0].step == 0)
+
+def test_string_tables():
+	a = StructArray(Joint, joints())
+	b = StructArray(Joint, [Joint(name="other")])
+	assert(a.column("name") == ["joint0", "joint1", "joint2"]*2)
+	assert(b.column("name") == ["other"])
+
+	# Each array has its own table, shared with the arrays made from its rows
+	table = a._codecs[0]
+	assert(table is not b._codecs[0])
+	assert(table.strings == ["joint0", "joint1", "joint2"])
+	assert(a[2:4]._codecs[0] is table)
+
+	# Filtering does not add strings
+	assert(a.filter(name="never-stored") == [])
+	assert(table.strings == ["joint0", "joint1", "joint2"])
+
+def test_optional_values():
+	class Sample(Struct):
+		__ATTRIBUTES__ = [IntegerParameter(name="count", default=None),
+		                  FloatParameter(name="ratio", default=0.5),
+		                  BoolParameter(name="valid", default=None),
+		                  StringParameter(name="label", default="none")]
+
+	# None and "" give the default value, as in Structs
+	rows = [dict(count=None, ratio=None, valid=None, label=""), dict(count=3, ratio="", valid=1, label="a")]
+	a = StructArray(Sample, rows)
+	assert(a == [Sample(**row) for row in rows])
+	assert(a.column("count") == [None, 3])
+	assert(a.column("ratio") == [0.5, 0.5])
+	assert(a.column("valid") == [None, True])
+	assert(a.column("label") == ["none", "a"])
+
+	a[1].count = None
+	a[1].ratio = 2
+	assert(a[1] == Sample(ratio=2., valid=True, label="a"))
+	assert(a.filter(count=None) == [Sample(), Sample(ratio=2., valid=True, label="a")])
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017, Softbank Robotics Europe
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# Standard libraries
+import copy
+import pickle
+import sys
+
+# Third-party libraries
+import pytest
+
+# Local modules
+from strong_typing import Struct
+from strong_typing.typed_containers import TypedArray, TypedList
+from strong_typing.typed_parameters import VectorParameter
+
+def test_default():
+	a = TypedArray(int)
+	b = TypedArray(float)
+
+def test_parameters():
+	a = TypedArray(int, [0,1])
+	b = TypedArray(float, (x for x in range(3)))
+
+def test_bad_parameters():
+	a = TypedArray(int, ["0",1.5])
+	assert(a == [0,1])
+	with pytest.raises(TypeError):
+		a = TypedArray(int, ["a",1])
+	with pytest.raises(TypeError):
+		a = TypedArray(str)
+
+def test_typename():
+	assert(TypedArray(int).typename == int)
+	assert(TypedArray(float).typename == float)
+
+def test_addition():
+	my_array = TypedArray(int)
+	assert(len(my_array)) == 0
+	my_array.appendDefault()
+	my_array.extend([0,1.1])
+	my_array.insert(1,10)
+	my_array[4:] = [100, 20, "15"]
+	my_array[4] = 17
+	my_array.append("15")
+	my_array += [3]
+	assert(len(my_array)) == 9
+	assert(my_array == [0,10,0,1, 17, 20, 15, 15, 3])
+	assert(my_array == TypedList(int, [0,10,0,1, 17, 20, 15, 15, 3]))
+	assert(TypedList(int, [0,10,0,1, 17, 20, 15, 15, 3]) == my_array)
+	assert(my_array != 0) # not a list
+	assert(my_array != TypedArray(float, [0, 10, 0, 1, 17, 20, 15, 15, 3])) # different type
+	assert(my_array != TypedList(float, [0, 10, 0, 1, 17, 20, 15, 15, 3])) # different type
+	assert(my_array != TypedArray(int, [0, 10, 0, 1, 17, 20, 15, 15])) # different length
+	assert(my_array != TypedArray(int, [0, 10, 0, 1, 17, 20, 15, 15, 1])) # different content
+
+def test_no_addition():
+	my_array = TypedArray(float)
+	my_array.append(0)
+	with pytest.raises(TypeError):
+		my_array.append("a")
+	with pytest.raises(TypeError):
+		my_array.extend([0, "a"])
+	with pytest.raises(TypeError):
+		my_array.insert(0,"toto")
+	with pytest.raises(TypeError):
+		my_array[0:] = [100, 20, "aq"]
+	with pytest.raises(TypeError):
+		my_array[0] = "s"
+	assert(my_array == [0.0])
+
+def test_list_behaviour():
+	my_array = TypedArray(int, [3, 1, 2])
+	assert(type(my_array[0:2]) is TypedArray and my_array[0:2] == [3, 1])
+	assert(type(my_array[::-1]) is TypedArray and my_array[::-1].typename is int)
+	assert(type(my_array + [4]) is TypedArray and my_array + [4] == [3, 1, 2, 4])
+	assert(type(my_array*2) is TypedArray and 2*my_array == [3, 1, 2]*2)
+	with pytest.raises(TypeError):
+		my_array + ["a"]
+	my_array.sort()
+	assert(my_array == [1, 2, 3])
+	my_array.sort(key=lambda x: -x)
+	assert(my_array == [3, 2, 1])
+	my_array.sort(reverse=True)
+	assert(my_array == [3, 2, 1])
+
+	# Numbers too large for the array are refused like wrong types
+	for add in [my_array.append, lambda x: my_array.insert(0, x), lambda x: my_array.extend([x]),
+	            lambda x: my_array.__setitem__(0, x), lambda x: TypedArray(int, [x])]:
+		with pytest.raises(TypeError):
+			add(2**64)
+	with pytest.raises(TypeError):
+		TypedArray(float, [10**400])
+	assert(my_array == [3, 2, 1])
+
+	copied = my_array.copy()
+	assert(type(copied) is TypedArray and copied == my_array and copied is not my_array)
+	my_array.clear()
+	assert(len(my_array) == 0 and copied == [3, 2, 1])
+
+def test_copy():
+	my_array = TypedArray(float, [1, 2])
+	for copied in [copy.copy(my_array), copy.deepcopy(my_array), pickle.loads(pickle.dumps(my_array))]:
+		assert(copied == my_array)
+		assert(copied is not my_array)
+		assert(type(copied) is TypedArray and copied.typename is float)
+
+@pytest.mark.skipif(sys.version_info < (3,0), reason="arrays only support the old buffer protocol in Python 2")
+def test_buffer():
+	view = memoryview(TypedArray(float, [1, 2]))
+	assert(view.format == "d")
+	assert(view.tolist() == [1.0, 2.0])
+
+def test_numpy():
+	numpy = pytest.importorskip("numpy")
+	values = numpy.array(TypedArray(int, [1, 2, 3]))
+	assert(values.dtype.kind == "i")
+	assert(values.tolist() == [1, 2, 3])
+	assert(numpy.array(TypedArray(float)).dtype == numpy.float64)
+
+def test_vector_parameter():
+	class VectorStruct(Struct):
+		__ATTRIBUTES__= [
+			VectorParameter(type=int, name="ints", default=[1], packed=True),
+			VectorParameter(type=float, name="floats", packed=True),
+			VectorParameter(type=float, name="float_list"),
+			VectorParameter(type=str, name="strings"),
+		]
+
+	instance = VectorStruct(floats=["1.5"])
+	assert(type(instance.ints) is TypedArray and instance.ints == [1])
+	assert(type(instance.floats) is TypedArray and instance.floats == [1.5])
+	assert(type(instance.float_list) is TypedList)
+	assert(type(instance.strings) is TypedList)
+	assert(VectorStruct(instance) == instance)
+	assert(VectorStruct(instance).floats is not instance.floats)
+
+	with pytest.raises(TypeError):
+		VectorParameter(type=str, name="packed_strings", packed=True)
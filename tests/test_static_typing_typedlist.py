@@ -28,11 +28,20 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+# Standard libraries
+import copy
+import pickle
+
 # Third-party libraries
 import pytest
 
 # Local modules
+from strong_typing import Struct
 from strong_typing.typed_containers import TypedList
+from strong_typing.typed_parameters import IntegerParameter, VectorParameter
+
+class RecordStruct(Struct):
+	__ATTRIBUTES__= [IntegerParameter(name="value", range=[0,10])]
 
 def test_default():
 	a = TypedList(int)
@@ -98,6 +107,88 @@ def test_set_values():
 	my_list[0:3:2] = [1, 2]
 	assert(my_list == [1, 0, 2])
 
+def test_bulk_addition():
+	my_list = TypedList(int, TypedList(int, [1, 2]))
+	my_list.extend(x for x in [3, True])
+	my_list.extend(TypedList(float, [5.5]))
+	my_list[0:2] = set(["7"])
+	assert(my_list == [7, 3, True, 5])
+	assert([type(x) for x in my_list] == [int, int, bool, int])
+	with pytest.raises(TypeError):
+		my_list.extend([1, 2, "a"])
+	assert(my_list == [7, 3, True, 5])
+
+def test_pickle():
+	my_list = TypedList(int, [1, 2, 3])
+	for protocol in range(pickle.HIGHEST_PROTOCOL+1):
+		loaded = pickle.loads(pickle.dumps(my_list, protocol))
+		assert(type(loaded) is TypedList)
+		assert(loaded.typename is int)
+		assert(loaded == my_list)
+		with pytest.raises(TypeError):
+			loaded.append("a")
+
+	my_list = TypedList(RecordStruct, [dict(value=1)], lazy=True)
+	loaded = pickle.loads(pickle.dumps(my_list, pickle.HIGHEST_PROTOCOL))
+	assert(loaded.lazy)
+	assert(loaded == [RecordStruct(value=1)])
+
+def test_lazy():
+	records = [dict(value=i) for i in range(5)] + [RecordStruct(value=20)]
+	my_list = TypedList(RecordStruct, records, lazy=True)
+	assert(my_list.lazy and not TypedList(RecordStruct).lazy)
+	assert(list.__getitem__(my_list, 0) is records[0])
+
+	# Elements are converted on access, and kept
+	assert(my_list[1] == RecordStruct(value=1))
+	assert(my_list[1] is my_list[1])
+	assert(my_list[-1].value == 10)
+	assert([record.value for record in my_list[2:4]] == [2, 3])
+	assert(RecordStruct(value=4) in my_list)
+	assert(my_list.pop(0).value == 0)
+	my_list.append(dict(value=6))
+	assert(type(list.__getitem__(my_list, -1)) is dict)
+	assert([record.value for record in my_list] == [1, 2, 3, 4, 10, 6])
+	assert(my_list == TypedList(RecordStruct, [dict(value=i) for i in [1, 2, 3, 4, 10, 6]]))
+
+	# Copies keep the elements to convert
+	my_list.append(dict(value=7))
+	for copied in [copy.copy(my_list), copy.deepcopy(my_list), TypedList(RecordStruct, my_list, lazy=True)]:
+		assert(copied.lazy)
+		assert(type(list.__getitem__(copied, -1)) is dict)
+		assert(copied[-1].value == 7)
+
+	# Errors are raised on access, or by materialize()
+	my_list.append(dict(unknown=1))
+	with pytest.raises(TypeError):
+		my_list[-1]
+	with pytest.raises(TypeError):
+		my_list.materialize()
+	del my_list[-1]
+
+	# Methods reading the elements from C convert them first
+	my_list.append(dict(value=8))
+	assert(not "value" in repr(my_list))
+	assert(type(list.__getitem__(my_list, -1)) is RecordStruct)
+	my_list.append(dict(value=9))
+	if hasattr(list, "copy"):
+		assert(type(my_list.copy()[-1]) is RecordStruct)
+	my_list.append(dict(value=10))
+	assert(my_list <= my_list)
+	assert(type(list.__getitem__(my_list, -1)) is RecordStruct)
+
+	assert(my_list.materialize() is my_list)
+	assert(not any(type(record) is dict for record in list.__iter__(my_list)))
+
+def test_lazy_vector_parameter():
+	class RecordsStruct(Struct):
+		__ATTRIBUTES__= [VectorParameter(type=RecordStruct, name="records", lazy=True)]
+
+	instance = RecordsStruct(records=[dict(value=1), dict(value=2)])
+	assert(instance.records.lazy)
+	assert(instance.records[1].value == 2)
+	assert(RecordsStruct(instance).records.lazy)
+
 # class MultipleTypedListManipulationTest(unittest.TestCase):
 
 # 	def setUp(self):
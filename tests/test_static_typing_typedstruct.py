@@ -28,11 +28,25 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+# Standard libraries
+import copy
+import sys
+
 # Third-party libraries
 import pytest
 
 # Local modules
-from strong_typing import Struct
+from strong_typing import (Struct,
+                           Drop,
+                           Fill,
+                           Rename,
+                           Transform,
+                           Version,
+                           VersionedStruct,
+                           ValidationLevel,
+                           getValidationLevel,
+                           setValidationLevel,
+                           validationLevel)
 from strong_typing.typed_parameters import *
 from strong_typing.typed_parameters.normalizers import *
 
@@ -68,4 +82,386 @@ def test_new_struct():
 	assert(instanceA != instanceB)
 
 	instanceD = AStruct(instanceA)
-	assert(instanceA == instanceD)
\ No newline at end of file
+	assert(instanceA == instanceD)
+def test_compiled_init():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1),
+		                 StringParameter(name="b", default="x")]
+
+	instance = AStruct(2.0, b=3)
+	assert(instance.a == 2)
+	assert(instance.b == "3")
+	instance = AStruct(None, "")
+	assert(instance.a == 1)
+	assert(instance.b == "x")
+
+	with pytest.raises(TypeError) as e:
+		AStruct(0, "a", 2)
+	assert("__init__() takes at most 2 arguments (3 given)" in str(e.value))
+	with pytest.raises(TypeError) as e:
+		AStruct(c=0)
+	assert("__init__() got an unexpected keyword argument 'c'" in str(e.value))
+
+	# A keyword overrides the same parameter given by position
+	instance = AStruct(2, a=3)
+	assert(instance.a == 3)
+	assert(instance.b == "x")
+
+def test_builtin_ids():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="len"),
+		                 IntegerParameter(name="setattr")]
+
+	instance = AStruct(1, setattr=2)
+	assert(instance.len == 1)
+	assert(instance.setattr == 2)
+	with pytest.raises(TypeError) as e:
+		AStruct(1, 2, 3)
+	assert("__init__() takes at most 2 arguments (3 given)" in str(e.value))
+	with pytest.raises(TypeError) as e:
+		AStruct(len=1, setattr=5, foo=2)
+	assert("__init__() got an unexpected keyword argument 'foo'" in str(e.value))
+
+def test_custom_init():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1)]
+
+		def __init__(self, a):
+			Struct.__init__(self, a=a+1)
+
+	class BStruct(AStruct):
+		pass
+
+	assert(AStruct(1).a == 2)
+	assert(BStruct(1).a == 2)
+
+def test_parent_init():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a"),
+		                 StringParameter(name="b")]
+
+	AStruct(1, "x")
+
+	# The parent's constructor assigns the arguments to the subclass' parameters
+	class BStruct(AStruct):
+		__ATTRIBUTES__= AStruct.__ATTRIBUTES__ + [FloatParameter(name="c")]
+
+		def __init__(self, *args):
+			super(BStruct, self).__init__(*args)
+
+	class CStruct(AStruct):
+		__ATTRIBUTES__= [StringParameter(name="b"),
+		                 IntegerParameter(name="a")]
+
+		def __init__(self, *args):
+			AStruct.__init__(self, *args)
+
+	assert(dict(BStruct(1, "x", 2.5)) == dict(a=1, b="x", c=2.5))
+	assert(dict(CStruct("x", 1)) == dict(a=1, b="x"))
+
+def test_custom_setattr():
+	assigned = []
+
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a")]
+
+	class BStruct(AStruct):
+		def __setattr__(self, name, value):
+			assigned.append(name)
+			AStruct.__setattr__(self, name, value)
+
+	AStruct(1)
+	assert(BStruct(2).a == 2)
+	assert(BStruct(BStruct(3)).a == 3)
+	assert(assigned == ["a"]*3)
+
+def test_non_identifier_ids():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="if", default=1),
+		                 IntegerParameter(name="My int")]
+
+	instance = AStruct(2, **{"my_int":3})
+	assert(getattr(instance, "if") == 2)
+	assert(instance.my_int == 3)
+
+def test_contains():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1)]
+
+	instance = AStruct()
+	assert("a" in instance)
+	assert(not "_a" in instance)
+	assert(not "keys" in instance)
+	assert(list(instance.keys()) == ["a"])
+
+@pytest.mark.skipif(sys.version_info < (3,0), reason="collections ABCs have no __slots__ in Python 2")
+def test_memory_footprint():
+	class ReferenceStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a"),
+		                 FloatParameter(name="b"),
+		                 StringParameter(name="c")]
+
+	class ReferenceVersionedStruct(VersionedStruct):
+		__ATTRIBUTES__= ReferenceStruct.__ATTRIBUTES__
+		__ATT_VERSIONS__ = [None, None, None]
+
+	class ReferenceSlots(object):
+		# Smallest possible object holding three values
+		__slots__ = ["_a", "_b", "_c"]
+
+	for instance in [ReferenceStruct(1, 2.0, "3"), ReferenceVersionedStruct(1, 2.0, "3")]:
+		assert(not hasattr(instance, "__dict__"))
+		assert(sys.getsizeof(instance) == sys.getsizeof(ReferenceSlots()))
+
+def test_shared_descriptors():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1, description="An int"),
+		                 VectorParameter(type=int, name="b")]
+
+	class BStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="c"),
+		                 VectorParameter(type=int, name="d")]
+
+	assert(type(AStruct.__dict__["a"]) is type(BStruct.__dict__["c"]))
+	assert(type(AStruct.__dict__["b"]) is type(BStruct.__dict__["d"]))
+	assert(AStruct.__dict__["a"].__doc__ == "An int\n\nDefault: 1\n\n")
+
+	# Mutable defaults are never shared between instances
+	first, second = AStruct(), AStruct()
+	first.b.append(1)
+	assert(second.b == [])
+
+def test_lazy_documentation():
+	textualized = []
+
+	class InnerStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1)]
+
+		def __str__(self):
+			textualized.append(self)
+			return Struct.__str__(self)
+
+	class OuterStruct(Struct):
+		__DESCRIPTION__ = "Outer struct"
+		__ATTRIBUTES__= [StructParameter(type=InnerStruct, name="inner", default=InnerStruct())]
+
+	assert(len(textualized) == 0)
+	assert(OuterStruct.__doc__.startswith("Outer struct\n\n:Parameters:"))
+	assert(len(textualized) == 1)
+	assert(OuterStruct.__doc__.startswith("Outer struct\n\n:Parameters:"))
+	assert(len(textualized) == 1)
+
+	# Instances give the documentation of their class
+	assert(OuterStruct().__doc__ is OuterStruct.__doc__)
+	assert(InnerStruct().__doc__.startswith("\n\n:Parameters:"))
+	assert(len(textualized) == 1)
+
+	class AVersionedStruct(VersionedStruct):
+		__ATTRIBUTES__= [IntegerParameter(name="a")]
+		__ATT_VERSIONS__ = [None]
+
+	assert(AVersionedStruct().__doc__.startswith("AVersionedStruct (current version: 1.0)"))
+
+def test_from_trusted():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1, range=[0,10]),
+		                 StringParameter(name="b")]
+
+	instance = AStruct._fromTrusted((5, "x"))
+	assert(instance.a == 5)
+	assert(instance.b == "x")
+	instance = AStruct._fromTrusted(dict(b="y"))
+	assert(instance.a == 1)
+	assert(instance.b == "y")
+
+	# Values are not checked
+	assert(AStruct._fromTrusted((20,)).a == 20)
+
+	with pytest.raises(TypeError):
+		AStruct._fromTrusted((1, "x", 3))
+	with pytest.raises(TypeError):
+		AStruct._fromTrusted(dict(c=3))
+
+def test_validation_levels():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1, range=[0,10])]
+
+	assert(getValidationLevel() == ValidationLevel.FULL)
+	with validationLevel(ValidationLevel.TRUSTED):
+		assert(getValidationLevel() == ValidationLevel.TRUSTED)
+		instance = AStruct(20)
+		assert(instance.a == 20)
+		instance.a = None
+		assert(instance.a == 1)
+	assert(getValidationLevel() == ValidationLevel.FULL)
+
+	with validationLevel("off"):
+		instance = AStruct(a="20")
+		assert(instance.a == "20")
+		instance.a = None
+		assert(instance.a is None)
+
+	instance = AStruct(20)
+	assert(instance.a == 10)
+	instance.a = "20"
+	assert(instance.a == 10)
+
+	setValidationLevel(ValidationLevel.TRUSTED)
+	try:
+		instance.a = 20
+		assert(instance.a == 20)
+	finally:
+		setValidationLevel(ValidationLevel.FULL)
+
+def test_copy():
+	class InnerStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1),
+		                 VectorParameter(name="b", type=int, default=[1,2])]
+
+	class OuterStruct(Struct):
+		__ATTRIBUTES__= [StructParameter(name="inner", type=InnerStruct),
+		                 VectorParameter(name="inners", type=InnerStruct),
+		                 EnumParameter(name="c", choices=["x", "y"])]
+
+	source = OuterStruct(inner=dict(a=2, b=[3]), inners=[dict(a=4)], c="y")
+
+	# Copy constructor
+	result = OuterStruct(source)
+	assert(result == source)
+	assert(result.inner is not source.inner)
+	assert(result.inner.b is not source.inner.b)
+	assert(result.inners is not source.inners)
+	assert(result.inners.typename is InnerStruct)
+	result.inner.b.append(4)
+	assert(source.inner.b == [3])
+
+	# Shallow copy
+	result = copy.copy(source)
+	assert(result == source)
+	assert(result.inner is source.inner)
+
+	# Deep copy
+	result = copy.deepcopy(source)
+	assert(result == source)
+	assert(result.inner is not source.inner)
+	assert(result.inners[0] is not source.inners[0])
+	assert(result.inners.typename is InnerStruct)
+	result.inners.append(dict(a=5))
+	assert(len(source.inners) == 1)
+
+	# Unaccessed parameters keep their default
+	result = InnerStruct(InnerStruct())
+	assert(result.b == [1,2])
+
+def test_copy_custom_init():
+	class AStruct(Struct):
+		__ATTRIBUTES__= [IntegerParameter(name="a", default=1)]
+
+		def __init__(self, a=1):
+			Struct.__init__(self, a=a+1)
+
+	# Custom constructors still receive the copied values
+	assert(AStruct(AStruct(a=1)).a == 3)
+
+def test_version():
+	assert(Version.parse("1.0") == Version.parse("1.0.0"))
+	assert(Version.parse("1.0") is Version.parse("1.0"))
+	assert(hash(Version.parse("1.0")) == hash(Version.parse("1.0.0")))
+	assert(len(set([Version.parse("1.0"), Version.parse("1.0.0"), Version.parse("1.1")])) == 2)
+	assert(Version.parse("1.0a1") < Version.parse("1.0b1") < Version.parse("1.0") < Version.parse("1.0.1"))
+	assert(Version.parse("1.10") > "1.9")
+	assert(Version.parse("2.0") != None)
+	assert(str(Version.parse("1.2.0")) == "1.2")
+	assert(str(Version.parse("1.2.3b4")) == "1.2.3b4")
+	assert(Version.parse("1.2.3b4").version == (1, 2, 3))
+	assert(Version.parse("1.2.3b4").prerelease == ("b", 4))
+	assert(Version.parse("1.2").prerelease is None)
+	for invalid in ["1", "1.0.0.0", "1.0c1", "a.b", ""]:
+		with pytest.raises(ValueError):
+			Version.parse(invalid)
+
+def test_from_dict():
+	migrated = []
+
+	class AVersionedStruct(VersionedStruct):
+		__VERSION__ = "1.2"
+		__ATTRIBUTES__ = [IntegerParameter(name="a"),
+		                  IntegerParameter(name="b")]
+		__ATT_VERSIONS__ = [None, "1.2"]
+
+		@classmethod
+		def _fromOldDict(cls, data, version):
+			migrated.append(version)
+			data["b"] = data["a"]
+			return cls(**data)
+
+	assert(AVersionedStruct.version == Version.parse("1.2"))
+	assert(AVersionedStruct().version == "1.2")
+	assert(AVersionedStruct.fromDict(dict(a=1, b=2)) == AVersionedStruct(1, 2))
+	assert(AVersionedStruct.fromDict(dict(version="1.2.0", a=1, b=2)) == AVersionedStruct(1, 2))
+	assert(AVersionedStruct.fromDict(dict(version="1.3", a=1, b=2)) == AVersionedStruct(1, 2))
+	assert(AVersionedStruct.fromDict(dict(version="1.1", a=3)) == AVersionedStruct(3, 3))
+	assert(AVersionedStruct.fromDict(dict(version="1.1", a=4)) == AVersionedStruct(4, 4))
+	assert(migrated == [(1, 1, 0, 1, "", 0)]*2)
+	assert(isinstance(migrated[0], Version))
+
+	# Plans are resolved once per class and version
+	assert(AVersionedStruct._migrationPlan("1.1") is AVersionedStruct._migrationPlan("1.1"))
+	assert(AVersionedStruct._migrationPlan("1.1") is not AVersionedStruct._migrationPlan("1.2"))
+
+	class BVersionedStruct(AVersionedStruct):
+		__VERSION__ = "1.1"
+
+	assert(BVersionedStruct.fromDict(dict(version="1.1", a=5)) == BVersionedStruct(a=5))
+	with pytest.raises(ValueError):
+		AVersionedStruct.fromDict(dict(version="one", a=1))
+
+def test_migration_steps():
+	data = dict(a=1, b=2)
+	assert(Rename("a", "c")(data) == dict(c=1, b=2))
+	assert(Rename("d", "c")(data) == data)
+	assert(Drop("a")(data) == dict(b=2))
+	assert(Drop("d")(data) == data)
+	assert(Fill("c", 3)(data) == dict(a=1, b=2, c=3))
+	assert(Fill("a", 3)(data) == data)
+	assert(Fill("c", function=lambda data: data["a"]+data["b"])(data) == dict(a=1, b=2, c=3))
+	assert(Transform("a", str)(data) == dict(a="1", b=2))
+	assert(Transform("d", str)(data) == data)
+	assert(Transform(None, lambda data: dict(c=data["a"]))(data) == dict(c=1))
+	# Steps work on a copy
+	assert(data == dict(a=1, b=2))
+
+def test_declarative_migrations():
+	class AVersionedStruct(VersionedStruct):
+		__VERSION__ = "1.3"
+		__ATTRIBUTES__ = [IntegerParameter(name="count"),
+		                  FloatParameter(name="ratio"),
+		                  StringParameter(name="label")]
+		__ATT_VERSIONS__ = [None, "1.2", "1.3"]
+		__DEPRECATED_ATT_N_VERSIONS__ = [(StringParameter(name="comment"), None, "1.3")]
+		__MIGRATIONS__ = {"1.1": [Rename("n", "count")],
+		                  "1.2": [Fill("ratio", function=lambda data: data["count"]/2.0)],
+		                  "1.3": [Fill("label", "none"), Transform("label", str.upper)],
+		                  "2.0": [Drop("count")]}
+
+		@classmethod
+		def _fromOldDict(cls, data, version):
+			raise AssertionError("Declared migrations are used instead")
+
+	# Steps of every newer version are chained
+	assert(AVersionedStruct.fromDict(dict(version="1.0", n=4, comment="-")) == AVersionedStruct(4, 2.0, "NONE"))
+	assert(AVersionedStruct.fromDict(dict(version="1.1", count=4, label="a")) == AVersionedStruct(4, 2.0, "A"))
+	assert(AVersionedStruct.fromDict(dict(version="1.2", count=4, ratio=1.0)) == AVersionedStruct(4, 1.0, "NONE"))
+	assert(AVersionedStruct.fromDict(dict(version="1.3", count=4)) == AVersionedStruct(4))
+	assert(AVersionedStruct._migrationSteps(Version.parse("1.2"))[-1].id == "comment")
+	with pytest.raises(TypeError):
+		AVersionedStruct.fromDict(dict(version="1.3", count=4, comment="-"))
+
+	# Classes without declared migrations only remove deprecated parameters
+	class BVersionedStruct(VersionedStruct):
+		__VERSION__ = "1.1"
+		__ATTRIBUTES__ = [IntegerParameter(name="count")]
+		__DEPRECATED_ATT_N_VERSIONS__ = [(IntegerParameter(name="n"), None, "1.1")]
+
+	assert(BVersionedStruct.fromDict(dict(version="1.0", n=1, count=2)) == BVersionedStruct(2))
+	assert(":Deprecated parameters:" in BVersionedStruct.__doc__)
@@ -184,6 +184,20 @@ def test_numeric_del_value():
 	assert(instance.ranged_float == 1.0)
 	assert(instance.optional_float == None)
 
+def test_numeric_normalizers():
+	assert(IntegerParameter(name="int").valueNormalizer is int)
+	assert(FloatParameter(name="float").valueNormalizer is float)
+
+	minimum = IntegerParameter(name="minimum", range=[0,None]).valueNormalizer
+	maximum = FloatParameter(name="maximum", range=[None,"1.5"]).valueNormalizer
+	bounded = IntegerParameter(name="bounded", range=[0,10], normalizer=ODD_NORMALIZER)
+	assert([minimum(x) for x in [-1, "5"]] == [0, 5])
+	assert([maximum(x) for x in [2, "-5"]] == [1.5, -5.0])
+	# Bounds are normalized as well
+	assert(bounded.range == (1, 11))
+	assert([bounded.valueNormalizer(x) for x in [-4, 4, 12]] == [1, 5, 11])
+	assert(bounded.normalizer(None) is None)
+
 def test_bool_default_value():
 	instance = TypeCheckingBoolTestStruct()
 	assert(instance.bool == False)
@@ -201,6 +215,23 @@ def test_bool_set_value():
 	assert(instance.bool == False)
 	assert(instance.optional_bool == False)
 
+def test_bool_spellings():
+	lenient = BoolParameter(name="lenient").normalizer
+	strict = BoolParameter(name="strict", strict=True).normalizer
+
+	for normalizer in [lenient, strict]:
+		assert(normalizer(None) is None)
+		for value in [True, 1, "1", "true", "True", "YES", "on", u"On", " yes "]:
+			assert(normalizer(value) is True)
+		for value in [False, 0, "0", "false", "FALSE", "no", "Off", u"off"]:
+			assert(normalizer(value) is False)
+
+	# Other values are converted as before, unless the parameter is strict
+	assert([lenient(x) for x in [2, 0.5, 1.5, "anything"]] == [True, False, True, True])
+	for value in [2, 0.5, "anything", []]:
+		with pytest.raises(ValueError):
+			strict(value)
+
 def test_bool_del_value():
 	instance = TypeCheckingBoolTestStruct()
 
@@ -340,6 +371,40 @@ def test_enum_del_value():
 	assert(instance.enum_from_enum_with_default == Choices.B)
 	assert(instance.enum_from_enum_with_default2 == Choices.B)
 
+def test_enum_normalizer():
+	from_list = EnumParameter(name="from_list", choices=["a", "b", "c"])
+	from_enum = EnumParameter(name="from_enum", choices=Choices)
+	b = from_list.choices["b"]
+
+	assert(from_list.normalizer("b") is b)
+	assert(from_list.normalizer(b) is b)
+	assert(from_enum.normalizer("B") is Choices.B)
+	assert(from_enum.normalizer(Choices.B) is Choices.B)
+	assert(from_enum.normalizer(1) is Choices.B)
+
+	# Members are equal to their name, and hashed as such
+	assert(b == "b" and b != "c" and b != from_list.choices["c"])
+	assert(hash(b) == hash("b"))
+	assert(len(set([b, from_list.choices["b"], from_list.choices["c"]])) == 2)
+
+	# Values of enums built from a list are not accepted
+	with pytest.raises(KeyError):
+		from_list.normalizer(1)
+	with pytest.raises(KeyError):
+		from_list.normalizer("d")
+	with pytest.raises(ValueError):
+		from_enum.normalizer(EnumParameter(name="other", choices=["x"]).choices["x"])
+
+def test_enum_from_list_sharing():
+	first = EnumParameter(name="first", choices=["idle", "moving"])
+	second = EnumParameter(name="second", choices=["idle", "moving"], default="moving")
+	other = EnumParameter(name="other", choices=["moving", "idle"])
+
+	assert(first.choices is second.choices)
+	assert(first.choices is not other.choices)
+	assert(second.default is first.choices["moving"])
+	assert(other.choices["idle"] == "idle")
+
 def test_enum_failing_creation():
 	with pytest.raises(TypeError):
 		EnumParameter("a,b,c,d", name="not_a_correct_enum_nor_list")
@@ -464,6 +529,48 @@ def test_struct_default_value_stability():
 	# Make sure the struct's int is back to the default
 	assert(instance.struct_with_default.ranged_int == 5)
 
+def test_ownership():
+	class OwnershipTestStruct(Struct):
+		__ATTRIBUTES__= [
+			VectorParameter(type=int, name="copied_vector"),
+			VectorParameter(type=int, name="cloned_vector", ownership=Ownership.CLONE),
+			VectorParameter(type=int, name="taken_vector", ownership="take"),
+			StructParameter(type=InnerTestStruct, name="copied_struct"),
+			StructParameter(type=InnerTestStruct, name="cloned_struct", ownership=Ownership.CLONE),
+			StructParameter(type=InnerTestStruct, name="taken_struct", ownership="take", default=InnerTestStruct(5)),
+		]
+
+	instance = OwnershipTestStruct()
+	vector = TypedList(int, [1, 2])
+	struct = InnerTestStruct(5)
+	for id in instance:
+		setattr(instance, id, vector if id.endswith("vector") else struct)
+
+	assert(instance.copied_vector is not vector)
+	assert(instance.cloned_vector is not vector)
+	assert(instance.taken_vector is vector)
+	assert(instance.copied_struct is not struct)
+	assert(instance.cloned_struct is not struct)
+	assert(instance.taken_struct is struct)
+	for id in instance:
+		assert(instance[id] == (vector if id.endswith("vector") else struct))
+
+	# Other values are still converted
+	instance.taken_vector = ["3"]
+	assert(instance.taken_vector == [3])
+	instance.taken_struct = dict(ranged_int=20)
+	assert(instance.taken_struct.ranged_int == 10)
+	instance.taken_vector = TypedList(float, [1.5])
+	assert(instance.taken_vector == [1])
+
+	# Default values are never shared
+	assert(OwnershipTestStruct().taken_struct is not OwnershipTestStruct().taken_struct)
+	instance.taken_struct = None
+	assert(instance.taken_struct.ranged_int == 5)
+
+	with pytest.raises(ValueError):
+		VectorParameter(type=int, name="bad_ownership", ownership="borrow")
+
 # def test_failing_creation(self):
 # 	with pytest.raises(TypeError):
 # 		Vector(type=int, name="not_a_list as_default", default=10)